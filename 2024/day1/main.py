@@ -1,5 +1,19 @@
 import heapq
-from typing import DefaultDict
+import os
+import tempfile
+from collections import Counter
+from typing import DefaultDict, Iterator, NamedTuple
+
+import numpy as np
+
+from aoc.parsing import parse_ints, read_ints, read_line_chunks
+
+# Bytes of input parsed and sorted at a time by the chunked mode
+CHUNK_BYTES = 1 << 26
+# Values read from each sorted run at a time when merging them
+BLOCK_SIZE = 1 << 16
+# Runs merged at once, each open run holds a file descriptor
+MAX_RUNS = 64
 
 
 def get_input() -> list[str]:
@@ -24,19 +38,182 @@ def calculate_score(left: list[int], right_counter: DefaultDict[int, int]) -> in
     return total_score
 
 
+def read_location_ids(
+    file_name: str = "input.txt",
+) -> tuple[list[int], list[int], Counter[int]]:
+    ids = read_ints(file_name).reshape(-1, 2)
+    left, right = ids[:, 0].tolist(), ids[:, 1].tolist()
+    heapq.heapify(left)
+    heapq.heapify(right)
+    return left, right, Counter(right)
+
+
+def read_columns(file_name: str = "input.txt") -> tuple[np.ndarray, np.ndarray]:
+    ids = read_ints(file_name).reshape(-1, 2)
+    return ids[:, 0], ids[:, 1]
+
+
+def calculate_sum_numpy(left: np.ndarray, right: np.ndarray) -> int:
+    return int(np.abs(np.sort(left) - np.sort(right)).sum())
+
+
+def calculate_score_numpy(left: np.ndarray, right: np.ndarray) -> int:
+    values, counts = np.unique(right, return_counts=True)
+    if len(values) == 0:
+        return 0
+    i = np.minimum(np.searchsorted(values, left), len(values) - 1)
+    found = values[i] == left
+    return int((left[found] * counts[i[found]]).sum())
+
+
+class SortedRuns(NamedTuple):
+    """Sorted chunks of each column, saved as .npy files in directory."""
+
+    directory: tempfile.TemporaryDirectory
+    left: list[str]
+    right: list[str]
+
+
+def spill_sorted_runs(
+    file_name: str = "input.txt", chunk_bytes: int = CHUNK_BYTES
+) -> SortedRuns:
+    """
+    Sorts the input a chunk at a time so inputs larger than memory can be
+    merged back from disk, see merge_runs.
+    """
+    directory = tempfile.TemporaryDirectory()
+    runs = SortedRuns(directory, [], [])
+    for i, chunk in enumerate(read_line_chunks(file_name, chunk_bytes)):
+        ids = parse_ints(chunk).reshape(-1, 2)
+        if len(ids) == 0:
+            continue
+        for column, paths in enumerate((runs.left, runs.right)):
+            path = os.path.join(directory.name, f"{column}_{i}.npy")
+            np.save(path, np.sort(ids[:, column]))
+            paths.append(path)
+    for paths in (runs.left, runs.right):
+        while len(paths) > MAX_RUNS:
+            merged = [
+                merge_to_file(paths[i : i + MAX_RUNS])
+                for i in range(0, len(paths), MAX_RUNS)
+            ]
+            paths[:] = merged
+    return runs
+
+
+def merge_runs(paths: list[str], block_size: int = BLOCK_SIZE) -> Iterator[np.ndarray]:
+    """
+    Yields sorted blocks that concatenate to the merge of the runs, keeping
+    at most one block of each run in memory.
+    """
+    runs = [np.load(path, mmap_mode="r") for path in paths]
+    positions = [0] * len(runs)
+    buffers = [np.empty(0, dtype=np.int64)] * len(runs)
+    while True:
+        for i, run in enumerate(runs):
+            if len(buffers[i]) == 0 and positions[i] < len(run):
+                buffers[i] = np.array(run[positions[i] : positions[i] + block_size])
+                positions[i] += block_size
+        loaded = [buffer for buffer in buffers if len(buffer)]
+        if not loaded:
+            return
+        # Every value up to the smallest of the buffers' last values is loaded
+        cutoff = min(buffer[-1] for buffer in loaded)
+        block = []
+        for i, buffer in enumerate(buffers):
+            split = np.searchsorted(buffer, cutoff, side="right")
+            block.append(buffer[:split])
+            buffers[i] = buffer[split:]
+        yield np.sort(np.concatenate(block), kind="stable")
+
+
+def merge_to_file(paths: list[str]) -> str:
+    """Merges the runs into a single run saved next to the first one."""
+    path = paths[0].removesuffix(".npy") + "_merged.npy"
+    length = sum(len(np.load(run, mmap_mode="r")) for run in paths)
+    merged = np.lib.format.open_memmap(path, mode="w+", dtype=np.int64, shape=(length,))
+    position = 0
+    for block in merge_runs(paths):
+        merged[position : position + len(block)] = block
+        position += len(block)
+    merged.flush()
+    del merged
+    for run in paths:
+        os.remove(run)
+    return path
+
+
+def count_values(
+    blocks: Iterator[np.ndarray],
+) -> Iterator[tuple[np.ndarray, np.ndarray]]:
+    """Run length encodes a sorted stream of blocks, each value is yielded once."""
+    held = None
+    for block in blocks:
+        starts = np.flatnonzero(np.diff(block, prepend=block[0] - 1))
+        values, counts = block[starts], np.diff(starts, append=len(block))
+        # The last value of the previous block can continue in this one
+        if held is not None:
+            if values[0] == held[0]:
+                counts[0] += held[1]
+            else:
+                values = np.insert(values, 0, held[0])
+                counts = np.insert(counts, 0, held[1])
+        held = values[-1], counts[-1]
+        if len(values) > 1:
+            yield values[:-1], counts[:-1]
+    if held is not None:
+        yield np.array([held[0]]), np.array([held[1]])
+
+
+def calculate_sum_chunked(runs: SortedRuns) -> int:
+    total = 0
+    left_blocks, right_blocks = merge_runs(runs.left), merge_runs(runs.right)
+    left = right = np.empty(0, dtype=np.int64)
+    while True:
+        if len(left) == 0:
+            left = next(left_blocks, None)
+        if len(right) == 0:
+            right = next(right_blocks, None)
+        if left is None or right is None:
+            return total
+        n = min(len(left), len(right))
+        total += int(np.abs(left[:n] - right[:n]).sum())
+        left, right = left[n:], right[n:]
+
+
+def calculate_score_chunked(runs: SortedRuns) -> int:
+    total = 0
+    left_counts = count_values(merge_runs(runs.left))
+    right_counts = count_values(merge_runs(runs.right))
+    left, right = next(left_counts, None), next(right_counts, None)
+    while left is not None and right is not None:
+        (l_values, l_counts), (r_values, r_counts) = left, right
+        # Both sides hold every count of the values up to the cutoff
+        cutoff = min(l_values[-1], r_values[-1])
+        l_split = np.searchsorted(l_values, cutoff, side="right")
+        r_split = np.searchsorted(r_values, cutoff, side="right")
+        _, l_i, r_i = np.intersect1d(
+            l_values[:l_split],
+            r_values[:r_split],
+            assume_unique=True,
+            return_indices=True,
+        )
+        total += int((l_values[l_i] * l_counts[l_i] * r_counts[r_i]).sum())
+        left = (
+            (l_values[l_split:], l_counts[l_split:])
+            if l_split < len(l_values)
+            else next(left_counts, None)
+        )
+        right = (
+            (r_values[r_split:], r_counts[r_split:])
+            if r_split < len(r_values)
+            else next(right_counts, None)
+        )
+    return total
+
+
 def main():
-    inputs = get_input()
-    left: list[int] = []
-    right: list[int] = []
-    right_counter = DefaultDict(int)
-    for line in inputs:
-        # Could be more efficent
-        values = line.strip().split(" ")
-        l_value = int(values[0])
-        r_value = int(values[-1])
-        right_counter[r_value] += 1
-        heapq.heappush(left, l_value)
-        heapq.heappush(right, r_value)
+    left, right, right_counter = read_location_ids()
     # calculate score first because when summing we are popping from the heap
     score_answer = calculate_score(left, right_counter)
     sum_answer = calculate_sum(left, right)
@@ -1,63 +1,92 @@
-def parse_trail_map(lines: list[str]):
-    grid = []
-    for row in lines:
-        if row == "":
-            continue
-        grid.append([int(c) for c in row])
-    return grid
+from aoc.grid import Grid
 
+TRAILHEAD = b"0"
+SUMMIT = ord("9")
 
-def find_paths(trail_map: list[list[int]]):
+# A trail is 9 steps long, so the summits reachable from a cell are bits of the
+# square window around it: the summit dr rows down and dc columns right of the
+# cell is bit (dr + REACH) * WINDOW + dc + REACH
+REACH = SUMMIT - TRAILHEAD[0]
+WINDOW = 2 * REACH + 1
+CENTER = REACH * WINDOW + REACH
+# How the bit of a summit moves between the windows of cells UP, RIGHT, DOWN,
+# LEFT of each other
+WINDOW_SHIFTS = (-WINDOW, 1, WINDOW, -1)
+
+
+def parse_trail_map(lines: list[str]) -> Grid:
+    return Grid.from_text("\n".join(row for row in lines if row != ""))
+
+
+def find_paths(trail_map: Grid):
     def dfs(
         i: int,
-        j: int,
-        path: list[tuple[int, int]],
-        solutions: (
-            list[list[tuple[int, int]]] | dict[tuple[int, int], list[tuple[int, int]]]
-        ),
+        path: list[int],
+        solutions: list[list[int]] | dict[int, list[int]],
     ):
-        path.append((i, j))
-        v = trail_map[i][j]
-        if v == 9:
+        path.append(i)
+        # Heights are the digit characters, the border never is one higher
+        v = trail_map[i]
+        if v == SUMMIT:
             if isinstance(solutions, dict):
-                solutions[(i, j)] = path
+                solutions[i] = path
             else:
                 solutions.append(path)
             return solutions
 
-        def is_next(i: int, j: int):
-            return trail_map[i][j] - v == 1
-
-        if i + 1 < len(trail_map) and is_next(i + 1, j):
-            dfs(i + 1, j, [p for p in path], solutions)
-        if i - 1 >= 0 and is_next(i - 1, j):
-            dfs(i - 1, j, [p for p in path], solutions)
-        if j + 1 < len(trail_map[i]) and is_next(i, j + 1):
-            dfs(i, j + 1, [p for p in path], solutions)
-        if j - 1 >= 0 and is_next(i, j - 1):
-            dfs(i, j - 1, [p for p in path], solutions)
+        for offset in trail_map.offsets:
+            if trail_map[i + offset] - v == 1:
+                dfs(i + offset, [p for p in path], solutions)
         return solutions
 
     result = 0
     result_part_two = 0
-    for i in range(len(trail_map)):
-        for j in range(len(trail_map[i])):
-            v = trail_map[i][j]
-            if v == 0:
-                solutions = dfs(i, j, [], {})
-                result += len(solutions)
-                solutions = dfs(i, j, [], [])
-                result_part_two += len(solutions)
+    for i in trail_map.find_all(TRAILHEAD):
+        solutions = dfs(i, [], {})
+        result += len(solutions)
+        solutions = dfs(i, [], [])
+        result_part_two += len(solutions)
     return result, result_part_two
 
 
+def rate_trails(trail_map: Grid) -> tuple[int, int]:
+    """
+    The sum of the scores and the sum of the ratings of the trailheads, going
+    down from the summits one height at a time. Every cell on a trail gets the
+    number of trails from it to a summit and the set of summits it reaches,
+    pushed down from its neighbors one higher.
+    """
+    cells = trail_map.cells
+    trails = [0] * len(cells)
+    summits = [0] * len(cells)
+    layer = trail_map.find_all(bytes([SUMMIT]))
+    for i in layer:
+        trails[i] = 1
+        summits[i] = 1 << CENTER
+    moves = list(zip(trail_map.offsets, WINDOW_SHIFTS))
+    for height in range(SUMMIT - 1, TRAILHEAD[0] - 1, -1):
+        lower = []
+        for i in layer:
+            for offset, shift in moves:
+                j = i + offset
+                if cells[j] != height:
+                    continue
+                if not trails[j]:
+                    lower.append(j)
+                trails[j] += trails[i]
+                # The summits of i are the opposite way seen from j
+                summits[j] |= summits[i] >> shift if shift > 0 else summits[i] << -shift
+        layer = lower
+    score = sum(summits[i].bit_count() for i in layer)
+    rating = sum(trails[i] for i in layer)
+    return score, rating
+
+
 def main():
-    with open("input.txt") as file:
-        lines = file.read().splitlines()
-        trail = parse_trail_map(lines)
-        result, result_part_two = find_paths(trail)
-        print("RESULT: ", result)
-        print("RESULT PART TWO: ", result_part_two)
+    trail = Grid.from_file("input.txt")
+    result, result_part_two = rate_trails(trail)
+    print("RESULT: ", result)
+    print("RESULT PART TWO: ", result_part_two)
 
 
 if __name__ == "__main__":
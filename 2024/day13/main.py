@@ -1,6 +1,8 @@
 import re
 from typing import NamedTuple, TypedDict
 
+from aoc.parsing import read_ints
+
 
 class MachineOption(NamedTuple):
     tokens: int
@@ -34,6 +36,20 @@ def parse_input(input: str) -> list[ClawMachine]:
     ]
 
 
+def read_claw_machines(file_name: str = "input.txt") -> list[ClawMachine]:
+    return [
+        {
+            "option_a": MachineOption(OPTION_A_TOKEN_COST, a_x, a_y),
+            "option_b": MachineOption(OPTION_B_TOKEN_COST, b_x, b_y),
+            "prize_x": p_x,
+            "prize_y": p_y,
+        }
+        for a_x, a_y, b_x, b_y, p_x, p_y in read_ints(file_name, signed=False)
+        .reshape(-1, 6)
+        .tolist()
+    ]
+
+
 # Lets use math 4head
 def solve_claw_machine_with_math(machine: ClawMachine) -> int:
     P_x, P_y, option_a, option_b = (
@@ -56,9 +72,15 @@ def solve_claw_machine_with_math(machine: ClawMachine) -> int:
     return 0
 
 
-def solve_all_claw_machines(machines: list[ClawMachine]) -> int:
+def solve_all_claw_machines(machines: list[ClawMachine], offset: int = 0) -> int:
     result = 0
     for m in machines:
+        if offset:
+            m = {
+                **m,
+                "prize_x": m["prize_x"] + offset,
+                "prize_y": m["prize_y"] + offset,
+            }
         tokens = solve_claw_machine_with_math(m)
         if tokens:
             result += tokens
@@ -66,16 +88,11 @@ def solve_all_claw_machines(machines: list[ClawMachine]) -> int:
 
 
 def main():
-    with open("input.txt") as file:
-        input = file.read()
-        machines = parse_input(input)
-        result = solve_all_claw_machines(machines)
-        print("RESULT: ", result)
-        for m in machines:
-            m["prize_x"] += OFFSET
-            m["prize_y"] += OFFSET
-        result = solve_all_claw_machines(machines)
-        print("RESULT PART TWO: ", result)
+    machines = read_claw_machines()
+    result = solve_all_claw_machines(machines)
+    print("RESULT: ", result)
+    result = solve_all_claw_machines(machines, offset=OFFSET)
+    print("RESULT PART TWO: ", result)
 
 
 if __name__ == "__main__":
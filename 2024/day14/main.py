@@ -3,45 +3,65 @@ import functools
 import re
 from typing import DefaultDict, Literal, NamedTuple
 
+from aoc.parsing import read_ints
+
 
 WIDE = 101
 TALL = 103
-X_MID = WIDE // 2
-Y_MID = TALL // 2
-SIZE = X_MID * Y_MID
 NUM_SECONDS = 100
 
 type Quadrant = Literal["Q1", "Q2", "Q3", "Q4"]
 
 
+class Room(NamedTuple):
+    wide: int
+    tall: int
+
+    @property
+    def x_mid(self) -> int:
+        return self.wide // 2
+
+    @property
+    def y_mid(self) -> int:
+        return self.tall // 2
+
+    @property
+    def size(self) -> int:
+        return self.x_mid * self.y_mid
+
+
+ROOM = Room(WIDE, TALL)
+
+
 class Robot(NamedTuple):
     x: int
     y: int
     v_x: int
     v_y: int
 
-    def assign_qdrant(self) -> Quadrant | None:
-        if self.x < X_MID and self.y < Y_MID:
+    def assign_qdrant(self, room: Room = ROOM) -> Quadrant | None:
+        x_mid, y_mid = room.x_mid, room.y_mid
+        if self.x < x_mid and self.y < y_mid:
             return "Q1"
-        if self.x > X_MID and self.y < Y_MID:
+        if self.x > x_mid and self.y < y_mid:
             return "Q2"
-        if self.x > X_MID and self.y > Y_MID:
+        if self.x > x_mid and self.y > y_mid:
             return "Q3"
-        if self.x < X_MID and self.y > Y_MID:
+        if self.x < x_mid and self.y > y_mid:
             return "Q4"
         return None
 
-    def move(self) -> "Robot":
-        x = (self.x + self.v_x) % WIDE
-        y = (self.y + self.v_y) % TALL
+    def move(self, room: Room = ROOM, seconds: int = 1) -> "Robot":
+        x = (self.x + seconds * self.v_x) % room.wide
+        y = (self.y + seconds * self.v_y) % room.tall
         r = Robot(x, y, self.v_x, self.v_y)
         return r
 
-    def display(self):
+    def display(self, room: Room = ROOM):
         print("=========" * 10)
         print(self)
-        for i in range(TALL):
-            for j in range(WIDE):
+        for i in range(room.tall):
+            for j in range(room.wide):
                 if j == self.x and i == self.y:
                     print("1", end="")
                 else:
@@ -62,9 +82,20 @@ def parse_robots(input: str):
     ]
 
 
-def display_robots(robots: list[Robot]):
-    for i in range(TALL):
-        for j in range(WIDE):
+def read_robots(file_name: str = "input.txt") -> list[Robot]:
+    return [Robot(*robot) for robot in read_ints(file_name).reshape(-1, 4).tolist()]
+
+
+def find_room(robots: list[Robot]) -> Room:
+    # Inputs bigger than the puzzle room are sized by the robot furthest out
+    return Room(
+        max(WIDE, max(r.x for r in robots) + 1), max(TALL, max(r.y for r in robots) + 1)
+    )
+
+
+def display_robots(robots: list[Robot], room: Room = ROOM):
+    for i in range(room.tall):
+        for j in range(room.wide):
             robot_found = False
             for r in robots:
                 if j == r.x and i == r.y:
@@ -78,49 +109,54 @@ def display_robots(robots: list[Robot]):
     print("=========" * 10)
 
 
-def calculate_quadrant_entropy(qdrants: dict[Quadrant, int]):
+def calculate_quadrant_entropy(qdrants: dict[Quadrant, int], room: Room = ROOM):
     entropy = 0
+    size = room.size
     for q in qdrants.values():
-        p1 = (SIZE - q) / SIZE
-        p2 = q / SIZE
+        p1 = (size - q) / size
+        p2 = q / size
         entropy += p1 * math.log2(1 / p1) + (p2 * math.log2(1 / p2))
     entropy /= 4
     return entropy
 
 
-def simulate_robots(robots: list[Robot], seconds: int, debug: bool = False):
+def simulate_robots(
+    robots: list[Robot], seconds: int, debug: bool = False, room: Room = ROOM
+):
     min_entropy, min_entropy_second = float("inf"), -1
     for s in range(seconds):
         for i, r in enumerate(robots):
-            robots[i] = r.move()
+            robots[i] = r.move(room)
             if debug:
-                r.display()
-        _, qdrants = assign_robot_quadrant(robots)
-        entropy = calculate_quadrant_entropy(qdrants)
+                r.display(room)
+        _, qdrants = assign_robot_quadrant(robots, room)
+        entropy = calculate_quadrant_entropy(qdrants, room)
         # Checking the entropy reduces the number states we have to consider since most of the robot states are equally random.
         if entropy < min_entropy:
             min_entropy = entropy
             min_entropy_second = s
             print(f"Min entropy at second {min_entropy_second }: ", min_entropy)
-            display_robots(robots)
+            display_robots(robots, room)
 
 
-def assign_robot_quadrant(robots: list[Robot]) -> tuple[int, dict[Quadrant, int]]:
+def assign_robot_quadrant(
+    robots: list[Robot], room: Room = ROOM
+) -> tuple[int, dict[Quadrant, int]]:
     qdrants = DefaultDict(int)
     for r in robots:
-        if q := r.assign_qdrant():
+        if q := r.assign_qdrant(room):
             qdrants[q] += 1
     return functools.reduce(lambda a, b: a * b, qdrants.values()), qdrants
 
 
 def main():
-    with open("input.txt") as file:
-        robots = parse_robots(file.read().strip())
-        simulate_robots(robots, NUM_SECONDS)
-        result, _ = assign_robot_quadrant(robots)
-        print("RESULT: ", result)
-        # Find xmas tree
-        simulate_robots(robots, NUM_SECONDS * 100)
+    robots = read_robots()
+    room = find_room(robots)
+    simulate_robots(robots, NUM_SECONDS, room=room)
+    result, _ = assign_robot_quadrant(robots, room)
+    print("RESULT: ", result)
+    # Find xmas tree
+    simulate_robots(robots, NUM_SECONDS * 100, room=room)
 
 
 if __name__ == "__main__":
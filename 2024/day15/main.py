@@ -1,38 +1,23 @@
-from typing import Literal, NamedTuple, cast
+from typing import Literal, cast
 
+from aoc.grid import DOWN, LEFT, RIGHT, UP, Grid
 
-type Square = Literal["#", ".", "O", "@"]
-type Step = Literal["<", "v", ">", "^"]
-
-
-class Vector(NamedTuple):
-    x: int
-    y: int
-
-    def __add__(self, other):
-        x = self.x + other[0]
-        y = self.y + other[1]
-        return Vector(x, y)
-
-    def __sub__(self, other):
-        x = self.x - other[0]
-        y = self.y - other[1]
-        return Vector(x, y)
 
+type Step = Literal["<", "v", ">", "^"]
 
-Vectors: dict[Step, Vector] = {
-    "<": Vector(-1, 0),
-    "v": Vector(0, 1),
-    ">": Vector(1, 0),
-    "^": Vector(0, -1),
+STEP_DIRECTIONS: dict[Step, int] = {
+    "<": LEFT,
+    "v": DOWN,
+    ">": RIGHT,
+    "^": UP,
 }
 
-
-type WarehouseGrid = list[list[Square]]
+WALL, EMPTY, BOX, ROBOT = ord("#"), ord("."), ord("O"), ord("@")
+BOX_LEFT, BOX_RIGHT = ord("["), ord("]")
 
 
 class Warehouse:
-    def __init__(self, robot: Vector, grid: WarehouseGrid):
+    def __init__(self, robot: int, grid: Grid):
         self.robot = robot
         self.grid = grid
 
@@ -40,51 +25,44 @@ class Warehouse:
 
     def resize(self):
         self.resized = True
-        grid = []
         mapping = {
-            "#": "##",
-            "O": "[]",
-            ".": "..",
-            "@": "@.",
+            WALL: b"##",
+            BOX: b"[]",
+            EMPTY: b"..",
+            ROBOT: b"@.",
         }
-        for i, row in enumerate(self.grid):
-            cols = []
-            for j, col in enumerate(row):
-                cols += [n for n in mapping[col]]
-            grid.append(cols)
-        self._update_robot(Vector(self.robot.x, 0))
-        self.grid = grid
+        rows = [b"".join(mapping[col] for col in row) for row in self.grid.rows()]
+        self.grid = Grid.from_bytes(b"\n".join(rows))
+        self.robot = self.grid.find(b"@")
 
     def get_gps_coordinates(self):
         total = 0
-        for i, row in enumerate(self.grid):
-            for j, col in enumerate(row):
-                pos = Vector(j, i)
-                if self[pos] == "O" or self[pos] == "[":
-                    total += pos.y * 100 + pos.x
+        for pos in self.grid.find_all(b"O") + self.grid.find_all(b"["):
+            row, col = self.grid.pos(pos)
+            total += row * 100 + col
         return total
 
-    def _update_robot(self, vec: Vector):
-        self[self.robot] = "."
+    def _update_robot(self, vec: int):
+        self[self.robot] = EMPTY
         self.robot += vec
-        self[self.robot] = "@"
+        self[self.robot] = ROBOT
 
     def _box_dfs(
         self,
-        pos: Vector,
-        vec: Vector,
-        boxes: set[Vector],
-    ) -> set[Vector] | None:
+        pos: int,
+        vec: int,
+        boxes: set[int],
+    ) -> set[int] | None:
         """
         Finds all boxes in given direction
         """
-        if self[pos] == "#":
+        if self[pos] == WALL:
             return None
-        elif self[pos] == ".":
+        elif self[pos] == EMPTY:
             return set()
         boxes.add(pos)
         for box in (
-            pos + (Vectors[">"] if self[pos] == "[" else Vectors["<"]),
+            pos + (1 if self[pos] == BOX_LEFT else -1),
             pos + vec,
         ):
             if box in boxes:
@@ -95,82 +73,73 @@ class Warehouse:
             boxes = boxes.union(b)
         return boxes
 
-    def _apply_box_updates(self, vec: Vector, boxes: set[Vector]):
+    def _apply_box_updates(self, vec: int, boxes: set[int]):
         update_map = {}
         for box in boxes:
             new_pos = box + vec
             if box not in update_map:
-                update_map[box] = "."
+                update_map[box] = EMPTY
             if new_pos not in update_map or (
-                (curr := update_map[new_pos]) and curr == "."
+                (curr := update_map[new_pos]) and curr == EMPTY
             ):
                 update_map[new_pos] = self[box]
         for box, box_square in update_map.items():
             self[box] = box_square
 
-    def _move_robot_resized(self, vec: Vector):
+    def _move_robot_resized(self, vec: int):
         boxes = self._box_dfs(self.robot + vec, vec, set())
         if boxes is None:
             return
         self._apply_box_updates(vec, boxes)
         self._update_robot(vec)
 
-    def _move_robot(self, vec: Vector):
+    def _move_robot(self, vec: int):
         if self.resized:
             return self._move_robot_resized(vec)
         boxes = []
         new_pos = self.robot + vec
-        while self[new_pos] == "O":
+        while self[new_pos] == BOX:
             boxes.append(new_pos)
-            if self[new_pos + vec] == "#":
+            if self[new_pos + vec] == WALL:
                 break
             new_pos = new_pos + vec
         # move boxes, Check if they can be moved
-        if self[new_pos] == ".":
+        if self[new_pos] == EMPTY:
             while len(boxes):
                 box = boxes.pop()
-                self[box + vec] = "O"
+                self[box + vec] = BOX
         if len(boxes) == 0:
             self._update_robot(vec)
 
-    def move_robot(self, vec: Vector):
+    def move_robot(self, vec: int):
         if self.resized:
             return self._move_robot_resized(vec)
         return self._move_robot(vec)
 
-    def __getitem__(self, pos: Vector) -> Square:
-        return self.grid[pos.y][pos.x]
+    def __getitem__(self, pos: int) -> int:
+        return self.grid[pos]
 
-    def __setitem__(self, pos: Vector, square: Square):
-        self.grid[pos.y][pos.x] = square
+    def __setitem__(self, pos: int, square: int):
+        self.grid[pos] = square
 
     def display(self):
-        for row in self.grid:
-            print("".join(row))
+        print(self.grid)
 
 
 def parse_input(input: str) -> tuple[Warehouse, list[Step]]:
     [warehouse, steps] = input.split("\n\n")
 
-    warehouse_grid: WarehouseGrid = []
-    rows = warehouse.split("\n")
-    robot = (0, 0)
-    for i, row in enumerate(rows):
-        cols = []
-        for j, c in enumerate(row):
-            if c == "@":
-                robot = (j, i)
-            cols.append(cast(Square, c))
-        warehouse_grid.append(cols)
-    return Warehouse(robot=Vector(*robot), grid=warehouse_grid), [
+    grid = Grid.from_text(warehouse)
+    return Warehouse(robot=grid.find(b"@"), grid=grid), [
         cast(Step, s) for s in steps if s != "\n"
     ]
 
 
 def simulate_steps(warehouse: Warehouse, steps: list[Step]):
     for step in steps:
-        vec = Vectors[step]
-        if warehouse[warehouse.robot + vec] == "#":
+        # The offsets change when the warehouse is resized
+        vec = warehouse.grid.offsets[STEP_DIRECTIONS[step]]
+        if warehouse[warehouse.robot + vec] == WALL:
             continue
         warehouse.move_robot(vec)
     return warehouse
@@ -164,17 +164,15 @@ def solve(program: Program):
     valid_outputs = []
     for num_bits in bit_range:
         valid_outputs += program.fix_program(num_bits)
-    valid_outputs.sort()
-    print(bit_range)
-    print("ANSWER IS: ", min(valid_outputs))
-
-    solve(program)
+    return min(valid_outputs, default=None)
 
 
 def main():
     with open("input.txt") as file:
         program = parse_program(file.read().strip())
-        solve(program)
+        outputs = program.execute(program.registers["A"])
+        print("RESULT: ", ",".join(str(o) for o in outputs))
+        print("RESULT PART TWO: ", solve(program))
 
 
 if __name__ == "__main__":
@@ -1,5 +1,8 @@
 from collections import deque
-from typing import Literal, NamedTuple
+from typing import NamedTuple
+
+from aoc.grid import BORDER, Grid
+from aoc.parsing import read_ints
 
 
 MAX_X = 70
@@ -13,81 +16,83 @@ class BytePos(NamedTuple):
     y: int
 
 
-def parse_input():
-    byte_positions: list[BytePos] = []
-    with open(FILE_NAME, "r") as file:
-        for line in file.readlines():
-            x, y = line.split(",")
-            byte_positions.append(BytePos(int(x), int(y)))
-    return byte_positions
+def parse_input(file_name: str = FILE_NAME) -> list[BytePos]:
+    positions = read_ints(file_name, signed=False).reshape(-1, 2).tolist()
+    return [BytePos(x, y) for x, y in positions]
+
 
+CORRUPTED = ord("#")
 
-type SafeMemory = Literal["."]
-type CorruptedMemory = Literal["#"]
-type Path = Literal["O"]
+type MemorySpace = Grid
 
-type MemorySpace = list[list[SafeMemory | CorruptedMemory | Path]]
 
+def find_memory_size(byte_positions: list[BytePos]) -> tuple[int, int, int]:
+    """
+    Inputs bigger than the puzzle are sized by the byte furthest out, the number
+    of fallen bytes for part one scales with the memory area.
+    """
+    max_x = max(MAX_X, max(b.x for b in byte_positions))
+    max_y = max(MAX_Y, max(b.y for b in byte_positions))
+    area_ratio = (max_x + 1) * (max_y + 1) / ((MAX_X + 1) * (MAX_Y + 1))
+    return max_x, max_y, round(NUM_BYTES * area_ratio)
 
-def create_memory_space(byte_positions: list[BytePos], num_bytes: int):
-    memory: MemorySpace = [["." for _ in range(MAX_X + 1)] for _ in range(MAX_Y + 1)]
+
+def create_memory_space(
+    byte_positions: list[BytePos],
+    num_bytes: int,
+    max_x: int = MAX_X,
+    max_y: int = MAX_Y,
+):
+    memory: MemorySpace = Grid.filled(max_x + 1, max_y + 1)
     for b_pos in byte_positions[: min(num_bytes, len(byte_positions))]:
-        memory[b_pos.y][b_pos.x] = "#"
+        memory[memory.index(b_pos.y, b_pos.x)] = CORRUPTED
     return memory
 
 
 def display_memory_space(memory: MemorySpace):
-    for row in memory:
-        print("".join(row))
+    print(memory)
 
 
 def find_shortest_path(memory: MemorySpace, start: BytePos, target: BytePos):
-
-    visited: set[BytePos] = {start}
-    q: deque[BytePos] = deque([start])
-    prev: dict[BytePos, BytePos] = {}
+    start_index = memory.index(start.y, start.x)
+    target_index = memory.index(target.y, target.x)
+    visited = bytearray(len(memory.cells))
+    visited[start_index] = 1
+    q: deque[int] = deque([start_index])
+    prev: dict[int, int] = {}
     current = 0
     while current >= 0:
         curr = q.popleft()
-        if curr == target:
+        if curr == target_index:
             break
         current -= 1
-        neighbours = [
-            BytePos(curr.x - 1, curr.y),
-            BytePos(curr.x, curr.y - 1),
-            BytePos(curr.x + 1, curr.y),
-            BytePos(curr.x, curr.y + 1),
-        ]
-        for n in neighbours:
-            if (
-                n.x >= 0
-                and n.y >= 0
-                and n.x <= MAX_X
-                and n.y <= MAX_Y
-                and memory[n.y][n.x] != "#"
-                and n not in visited
-            ):
-                visited.add(n)
+        for offset in memory.offsets:
+            n = curr + offset
+            if memory[n] != CORRUPTED and memory[n] != BORDER and not visited[n]:
+                visited[n] = 1
                 prev[n] = curr
                 q.append(n)
         if current == -1:
             current = len(q) - 1
-    curr = target
-    path: set[BytePos] = set()
+    curr = target_index
+    path: set[int] = set()
     while p := prev.get(curr):
         path.add(curr)
         curr = p
     return path
 
 
-def solve_part_two(byte_positions: list[BytePos]):
+def solve_part_two(
+    byte_positions: list[BytePos], max_x: int = MAX_X, max_y: int = MAX_Y
+):
     start = BytePos(0, 0)
-    target = BytePos(MAX_X, MAX_Y)
-    memory: MemorySpace = [["." for _ in range(MAX_X + 1)] for _ in range(MAX_Y + 1)]
+    target = BytePos(max_x, max_y)
+    memory = create_memory_space([], 0, max_x, max_y)
     curr_path = find_shortest_path(memory, start, target)
     for byte_pos in byte_positions:
-        memory[byte_pos.y][byte_pos.x] = "#"
-        if byte_pos not in curr_path:
+        i = memory.index(byte_pos.y, byte_pos.x)
+        memory[i] = CORRUPTED
+        if i not in curr_path:
             continue
         curr_path = find_shortest_path(memory, start, target)
         if len(curr_path) == 0:
@@ -97,12 +102,13 @@ def solve_part_two(byte_positions: list[BytePos]):
 
 def main():
     byte_positions = parse_input()
-    memory = create_memory_space(byte_positions, NUM_BYTES)
+    max_x, max_y, num_bytes = find_memory_size(byte_positions)
+    memory = create_memory_space(byte_positions, num_bytes, max_x, max_y)
     start = BytePos(0, 0)
-    target = BytePos(MAX_X, MAX_Y)
+    target = BytePos(max_x, max_y)
     path = find_shortest_path(memory, start, target)
     print("RESULT: ", len(path))
-    result = solve_part_two(byte_positions)
+    result = solve_part_two(byte_positions, max_x, max_y)
     print("RESULT PART TWO: ", result)
 
 
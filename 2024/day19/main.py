@@ -3,8 +3,8 @@ import functools
 FILE_PATH = "input.txt"
 
 
-def parse_input():
-    with open(FILE_PATH, "r") as file:
+def parse_input(file_path: str = FILE_PATH):
+    with open(file_path, "r") as file:
         lines = file.readlines()
         towels = [t.strip() for t in lines[0].split(",")]
         patterns = [p.strip() for p in lines[2:]]
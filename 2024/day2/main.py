@@ -1,4 +1,12 @@
-from typing import Callable
+from typing import Callable, Iterable
+
+import numpy as np
+
+from aoc.parallel import imap_bounded
+from aoc.parsing import IntRecords, parse_records, read_line_chunks, read_records
+
+# Bytes of reports handed to a worker at a time by the streaming mode
+CHUNK_BYTES = 1 << 22
 
 
 def get_input() -> list[str]:
@@ -22,27 +30,133 @@ def is_level_safe_default(numbers: list[int]) -> bool:
     return True
 
 
+def find_violation(
+    numbers: list[int], should_be_ascending: bool, skip: int = -1, start: int = 0
+) -> int:
+    """
+    Index of the first number from start on that breaks the condition with the
+    number before it, as if numbers[skip] was removed. -1 if there is none.
+    """
+    prev = -1
+    for i in range(max(start, 0), len(numbers)):
+        if i == skip:
+            continue
+        if prev != -1 and is_condition_not_met(
+            numbers[i], numbers[prev], should_be_ascending
+        ):
+            return i
+        prev = i
+    return -1
+
+
 def is_level_safe_with_removal(numbers: list[int]) -> bool:
-    removal_index = -1
-    # O(N*N)
-    while removal_index < len(numbers):
-        if is_level_safe_default(
-            [numbers[i] for i in range(len(numbers)) if i != removal_index]
+    # O(N), everything before the first violation is fine so only removing
+    # one of the two numbers of the violating pair can make the level safe.
+    for should_be_ascending in (True, False):
+        i = find_violation(numbers, should_be_ascending)
+        if i == -1:
+            return True
+        # Skipping i - 1 pairs i - 2 with i, the pairs before it were fine
+        if (
+            find_violation(numbers, should_be_ascending, skip=i - 1, start=i - 2) == -1
+            or find_violation(numbers, should_be_ascending, skip=i, start=i - 1) == -1
         ):
             return True
-        removal_index += 1
     return False
 
 
+def find_safe_reports(
+    reports: Iterable[list[int]], is_level_safe: Callable[[list[int]], bool]
+) -> list[int]:
+    return [i for i, numbers in enumerate(reports) if is_level_safe(numbers)]
+
+
 def find_safe_levels(
     inputs: list[str], is_level_safe: Callable[[list[int]], bool]
 ) -> list[int]:
-    safe_levels = [
-        i
-        for i, line in enumerate(inputs)
-        if is_level_safe([int(n) for n in line.split(" ")])
-    ]
-    return safe_levels
+    return find_safe_reports(
+        ([int(n) for n in line.split(" ")] for line in inputs), is_level_safe
+    )
+
+
+def read_reports(file_name: str = "input.txt") -> list[list[int]]:
+    return read_records(file_name).tolist()
+
+
+def is_step_safe(before: np.ndarray, after: np.ndarray, ascending: bool) -> np.ndarray:
+    diff = after - before if ascending else before - after
+    return (diff >= 1) & (diff <= 3)
+
+
+def safe_with_removal_numpy(levels: np.ndarray) -> np.ndarray:
+    """
+    Removing level k is safe when the steps before k - 1 and after k + 1 are
+    safe and so is the step from k - 1 to k + 1, found for every k at once.
+    """
+    n, width = levels.shape
+    if width <= 2:
+        return np.ones(n, dtype=bool)
+    k = np.arange(width)
+    safe = np.zeros(n, dtype=bool)
+    for ascending in (True, False):
+        steps = is_step_safe(levels[:, :-1], levels[:, 1:], ascending)
+        skip_steps = is_step_safe(levels[:, :-2], levels[:, 2:], ascending)
+        ones = np.ones((n, 1), dtype=bool)
+        # before[:, j] is all of steps[:, :j], after[:, j] all of steps[:, j:]
+        before = np.hstack((ones, np.logical_and.accumulate(steps, axis=1)))
+        after = np.hstack(
+            (np.logical_and.accumulate(steps[:, ::-1], axis=1)[:, ::-1], ones)
+        )
+        bridged = np.hstack((ones, skip_steps, ones))
+        removable = (
+            before[:, np.maximum(k - 1, 0)]
+            & after[:, np.minimum(k + 1, width - 1)]
+            & bridged
+        )
+        safe |= removable.any(axis=1)
+    return safe
+
+
+def safe_default_numpy(levels: np.ndarray) -> np.ndarray:
+    before, after = levels[:, :-1], levels[:, 1:]
+    return is_step_safe(before, after, True).all(axis=1) | is_step_safe(
+        before, after, False
+    ).all(axis=1)
+
+
+def find_safe_reports_numpy(reports: IntRecords, with_removal: bool) -> np.ndarray:
+    """Vectorized find_safe_reports, reports of the same width are checked at once."""
+    is_safe = safe_with_removal_numpy if with_removal else safe_default_numpy
+    safe = [rows[is_safe(levels)] for rows, levels in reports.by_length()]
+    return np.sort(np.concatenate(safe)) if safe else np.empty(0, dtype=np.int64)
+
+
+def count_safe_chunk(chunk: bytes) -> tuple[int, int]:
+    reports = parse_records(chunk)
+    safe_default = safe_removal = 0
+    for _, levels in reports.by_length():
+        safe_default += int(safe_default_numpy(levels).sum())
+        safe_removal += int(safe_with_removal_numpy(levels).sum())
+    return safe_default, safe_removal
+
+
+def count_safe_reports(
+    file_name: str = "input.txt",
+    chunk_bytes: int = CHUNK_BYTES,
+    workers: int | None = None,
+) -> tuple[int, int]:
+    """
+    Counts the safe reports under both rules in one pass, reading the file a
+    chunk at a time and counting the chunks in a process pool.
+    """
+    counts = imap_bounded(
+        count_safe_chunk, read_line_chunks(file_name, chunk_bytes), workers
+    )
+    safe_default = safe_removal = 0
+    for chunk_default, chunk_removal in counts:
+        safe_default += chunk_default
+        safe_removal += chunk_removal
+    return safe_default, safe_removal
 
 
 def test_example_part_2():
@@ -76,15 +190,8 @@ def run_tests():
 
 
 def main():
-    inputs = get_input()
-
-    answer_one = len(
-        find_safe_levels(inputs=inputs, is_level_safe=is_level_safe_default)
-    )
+    answer_one, answer_two = count_safe_reports()
     print("Part one answer is: ", answer_one)
-    answer_two = len(
-        find_safe_levels(inputs=inputs, is_level_safe=is_level_safe_with_removal)
-    )
     print("Part two answer is: ", answer_two)
 
 
@@ -1,58 +1,29 @@
 import numpy as np
-from typing import NamedTuple
 
+from aoc.grid import Grid
 
-type Grid = list[list[str]]
-
-
-class GridPos(NamedTuple):
-    row: int
-    col: int
+TRACK = ord(".")
 
 
 def parse_input(file_path: str) -> Grid:
-    grid = []
-    with open(file_path, "r") as file:
-        rows = file.readlines()
-        for row in rows:
-            grid.append([c for c in row.strip()])
-    return grid
+    return Grid.from_file(file_path)
 
 
 def display_grid(grid: Grid):
-    for row in grid:
-        print("".join(row))
-
-
-def find_start_and_end(grid: Grid) -> tuple[GridPos, GridPos]:
-    start, end = GridPos(0, 0), GridPos(0, 0)
-    for i, row in enumerate(grid):
-        for j, col in enumerate(row):
-            if col == "S":
-                start = GridPos(i, j)
-            if col == "E":
-                end = GridPos(i, j)
-    return start, end
-
-
-def get_neighbours(p: GridPos, grid: Grid) -> list[GridPos]:
-    neighbours = []
-    NUM_ROWS = len(grid) - 2
-    NUM_COLS = len(grid[0]) - 2
-    if p.row > 1:
-        neighbours.append(GridPos(p.row - 1, p.col))
-    if p.row < NUM_ROWS:
-        neighbours.append(GridPos(p.row + 1, p.col))
-    if p.col > 1:
-        neighbours.append(GridPos(p.row, p.col - 1))
-    if p.col < NUM_COLS:
-        neighbours.append(GridPos(p.row, p.col + 1))
-    return neighbours
+    print(grid)
+
+
+def find_start_and_end(grid: Grid) -> tuple[int, int]:
+    return grid.find(b"S"), grid.find(b"E")
+
+
+def get_neighbours(p: int, grid: Grid) -> list[int]:
+    return [p + offset for offset in grid.offsets]
 
 
 def find_cheats(
-    cheat_start: GridPos,
-    path: dict[GridPos, int],
+    cheat_start: int,
+    path: dict[int, int],
     grid: Grid,
     max_distance: int,
     target: int,
@@ -60,20 +31,21 @@ def find_cheats(
     num_cheats = 0
 
     pre_walked_steps = path[cheat_start]
-
-    max_row = min(cheat_start.row + max_distance, len(grid) + 1)
-    max_col = min(cheat_start.col + max_distance, len(grid[0]) + 1)
-    min_row = max(cheat_start.row - max_distance, 0)
-    min_col = max(cheat_start.col - max_distance, 0)
+    start_row, start_col = grid.pos(cheat_start)
+
+    # Rows and columns are clamped to the grid, a column off the grid would wrap
+    # around to another row in the flat grid
+    max_row = min(start_row + max_distance, grid.height - 1)
+    max_col = min(start_col + max_distance, grid.width - 1)
+    min_row = max(start_row - max_distance, 0)
+    min_col = max(start_col - max_distance, 0)
     for i in range(min_row, max_row + 1):
-        row_offset = min(abs(cheat_start.row - i), 0)
+        row_offset = min(abs(start_row - i), 0)
         for j in range(min_col + row_offset, max_col + 1 - row_offset):
-            cheat_end = GridPos(i, j)
+            cheat_end = grid.index(i, j)
             if cheat_end not in path:
                 continue
-            dy, dx = abs(cheat_end.row - cheat_start.row), abs(
-                cheat_end.col - cheat_start.col
-            )
+            dy, dx = abs(i - start_row), abs(j - start_col)
             dist = dy + dx
             cheat_value = path[cheat_end] - dist - pre_walked_steps
             if dist <= max_distance and cheat_value >= target:
@@ -92,7 +64,7 @@ def dfs(grid: Grid):
         visited.add(curr)
         neighbours = get_neighbours(curr, grid)
         for n in neighbours:
-            if n in visited or grid[n.row][n.col] != ".":
+            if n in visited or grid[n] != TRACK:
                 continue
             stack.append(n)
     return path
@@ -1,4 +1,11 @@
 import enum
+import mmap
+import os
+import re
+import tempfile
+from typing import NamedTuple
+
+from aoc.parallel import imap_bounded
 
 
 def get_input() -> str:
@@ -90,7 +97,180 @@ def parse(tokens: MulSequence) -> int:
     return result
 
 
+# Groups in the order tokenize checks them, the ungrouped alternatives are
+# INVALID. A run of invalid chars resets the sequence just like a single one.
+TOKEN_REGEX = re.compile(
+    rb"(don't\(\))|(do\(\))|(mul)|(\()|(,)|(\))|([0-9]{1,3})|[^dm0-9(),]+|.",
+    re.DOTALL,
+)
+DONT, DO, MUL, OPEN, COMMA, CLOSE, DIGITS = range(1, 8)
+# Tokens only compare_token can match, they need a char after them
+WORDS = (DONT, DO, MUL)
+
+
+# Bytes scanned by a worker at a time by scan_parallel
+CHUNK_BYTES = 1 << 24
+# Chars that are never part of a multi char token. The sequence is reset
+# after them, so cutting the input after one of them only carries over
+# whether mul is enabled.
+SAFE_CUT = re.compile(rb"[^dont'mul0-9(),]")
+
+
+class ScanResult(NamedTuple):
+    # Sums for a scan starting with mul enabled and disabled
+    enabled_sum: int
+    disabled_sum: int
+    # Set by the last do() or don't(), None if there is neither
+    ends_disabled: bool | None
+
+
+def scan_range(
+    data: bytes | mmap.mmap, pos: int = 0, endpos: int | None = None
+) -> ScanResult:
+    """
+    Same result as parse(tokenize(text)) in one pass over the tokens, keeping
+    only the position in VALID_SEQ and the two numbers.
+
+    Once a do() or don't() is seen the rest of the scan doesn't depend on the
+    starting state, so the sum for a disabled start is the sum from there on.
+    """
+    endpos = len(data) if endpos is None else endpos
+    result = 0
+    seq_index = 0
+    left = right = 0
+    disabled = False
+    # Sum before the first do() or don't()
+    prefix = None
+    for match in TOKEN_REGEX.finditer(data, pos, endpos):
+        token = match.lastindex
+        if token in WORDS and match.end() == len(data):
+            token = None
+        if token == DONT or token == DO:
+            if prefix is None:
+                prefix = result
+            disabled = token == DONT
+        if disabled:
+            continue
+        # Numbers match every position of VALID_SEQ
+        if token == DIGITS:
+            if seq_index == 2:
+                left = int(match[DIGITS])
+            elif seq_index == 4:
+                right = int(match[DIGITS])
+            seq_index += 1
+        elif token == MUL:
+            seq_index = 1
+        elif (
+            (token == OPEN and seq_index == 1)
+            or (token == COMMA and seq_index == 3)
+            or (token == CLOSE and seq_index == 5)
+        ):
+            seq_index += 1
+        else:
+            seq_index = 0
+        if seq_index == SEQ_LEN:
+            result += left * right
+            seq_index = 0
+    if prefix is None:
+        return ScanResult(result, 0, None)
+    return ScanResult(result, result - prefix, disabled)
+
+
+def scan(data: bytes) -> int:
+    return scan_range(data).enabled_sum
+
+
+def read_memory(file_name: str = "input.txt") -> bytes:
+    with open(file_name, "rb") as file:
+        return file.read()
+
+
+def chunk_bounds(data: bytes | mmap.mmap, chunk_bytes: int) -> list[tuple[int, int]]:
+    bounds = []
+    start = 0
+    while start < len(data):
+        end = len(data)
+        if start + chunk_bytes < len(data):
+            cut = SAFE_CUT.search(data, start + chunk_bytes)
+            if cut:
+                end = cut.end()
+        bounds.append((start, end))
+        start = end
+    return bounds
+
+
+def scan_file_range(task: tuple[str, int, int]) -> ScanResult:
+    file_name, start, end = task
+    with open(file_name, "rb") as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            return scan_range(data, start, end)
+
+
+def scan_parallel(
+    file_name: str = "input.txt",
+    chunk_bytes: int = CHUNK_BYTES,
+    workers: int | None = None,
+) -> int:
+    """
+    scan() for inputs too big to read, the file is memory mapped and its
+    chunks are scanned in a process pool, then combined in order.
+    """
+    with open(file_name, "rb") as file:
+        # mmap can't map an empty file
+        if file.seek(0, 2) == 0:
+            return 0
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            bounds = chunk_bounds(data, chunk_bytes)
+    tasks = ((file_name, start, end) for start, end in bounds)
+    result = 0
+    disabled = False
+    for chunk in imap_bounded(scan_file_range, tasks, workers):
+        result += chunk.disabled_sum if disabled else chunk.enabled_sum
+        if chunk.ends_disabled is not None:
+            disabled = chunk.ends_disabled
+    return result
+
+
+EXAMPLE = "xmul(2,4)&mul[3,7]!^don't()_mul(5,5)+mul(32,64](mul(11,8)undo()?mul(8,5))"
+
+
+def test_example():
+    assert scan(EXAMPLE.encode()) == 48
+
+
+def test_scan_matches_tokens():
+    texts = [
+        EXAMPLE,
+        "xmul(1234,5)mul(12,34)x",
+        "don't()mul(2,3)do()mul(4,5)",
+        "xmul(2,3)do()",
+        "mul(2,3)mul(4,5)",
+        "xmul ( 2,3)mul(7,8",
+    ]
+    for text in texts:
+        assert scan(text.encode()) == parse(tokenize(text))
+
+
+def test_scan_parallel():
+    text = EXAMPLE + "mul(2,3)do()mul(4,5)" + EXAMPLE
+    with tempfile.TemporaryDirectory() as directory:
+        file_name = os.path.join(directory, "input.txt")
+        with open(file_name, "w") as file:
+            file.write(text)
+        # One byte chunks cut the memory at every safe place
+        assert scan_parallel(file_name, chunk_bytes=1) == parse(tokenize(text))
+        with open(file_name, "w"):
+            pass
+        assert scan_parallel(file_name) == 0
+
+
+def run_tests():
+    test_example()
+    test_scan_matches_tokens()
+    test_scan_parallel()
+
+
 if __name__ == "__main__":
-    text = get_input()
-    res = parse(tokenize(text))
+    run_tests()
+    res = scan(read_memory())
     print("Result: ", res)
@@ -1,121 +1,154 @@
-type LetterGrid = list[list[str]]
+import numpy as np
 
-XMAS = ["X", "M", "A", "S"]
-REVERSE_XMAS = ["S", "A", "M", "X"]
+from aoc.grid import Grid
 
-MAS = XMAS[1:]
-MAS_REVERSE = REVERSE_XMAS[:-1]
+XMAS = b"XMAS"
+M, S = ord("M"), ord("S")
 
+# Cells of a stencil that match any letter
+WILDCARD = ord(".")
 
-def get_diagonal_letters(
-    grid: LetterGrid,
-    i: int,
-    j: int,
-    row_increment: int,
-    col_increment: int,
-    letter_count: int,
-):
-    letters = []
-    for _ in range(letter_count + 1):
-        letters.append(grid[i][j])
-        i += row_increment
-        j += col_increment
-    return letters
+type Stencil = tuple[bytes, ...]
 
+# The MAS cross of part two, see symmetries for the other ways it can be read
+X_MAS: Stencil = (
+    b"M.S",
+    b".A.",
+    b"M.S",
+)
 
-def check_xmas_directions(grid: LetterGrid, i: int, j: int) -> int:
-    def is_xmas(t: list[str]) -> bool:
-        return t == XMAS or t == REVERSE_XMAS
+# (row, col) steps of the 8 directions a word can be read in
+WORD_DIRECTIONS = [
+    (d_row, d_col)
+    for d_row in (-1, 0, 1)
+    for d_col in (-1, 0, 1)
+    if (d_row, d_col) != (0, 0)
+]
 
-    def get_xmas_diagnonal_letters(row_increment: int, col_increment: int):
-        return get_diagonal_letters(grid, i, j, row_increment, col_increment, 3)
 
+def check_xmas_directions(grid: Grid, i: int) -> int:
     directions: int = 0
-
-    top_bound = i - 3 >= 0
-    bottom_bound = i + 3 < len(grid)
-    right_bound = j + 3 < len(grid[i])
-    left_bound = j - 3 >= 0
-    # left
-    if left_bound:
-        directions += is_xmas(grid[i][j - 3 : j + 1])
-    # right
-    if right_bound:
-        directions += is_xmas(grid[i][j : j + 4])
-    # top
-    if top_bound:
-        directions += is_xmas([row[j] for row in grid[i - 3 : i + 1]])
-    # bottom
-    if bottom_bound:
-        directions += is_xmas([row[j] for row in grid[i : i + 4]])
-    # top left
-    if left_bound and top_bound:
-        letters = get_xmas_diagnonal_letters(-1, -1)
-        directions += is_xmas(letters)
-    # top right
-    if right_bound and top_bound:
-        letters = get_xmas_diagnonal_letters(-1, 1)
-        directions += is_xmas(letters)
-    # bottom left
-    if left_bound and bottom_bound:
-        letters = get_xmas_diagnonal_letters(1, -1)
-        directions += is_xmas(letters)
-    # bottom right
-    if right_bound and bottom_bound:
-        letters = get_xmas_diagnonal_letters(1, 1)
-        directions += is_xmas(letters)
+    for offset in grid.offsets + grid.diagonal_offsets:
+        # A step off the grid lands on the border which never matches a letter,
+        # so the word can't run further than that.
+        if (
+            grid[i + offset] == XMAS[1]
+            and grid[i + 2 * offset] == XMAS[2]
+            and grid[i + 3 * offset] == XMAS[3]
+        ):
+            directions += 1
     return directions
 
 
-def check_xmas_directions_part_two(grid: LetterGrid, i: int, j: int) -> int:
-    def is_word(t: list[str]) -> bool:
-        return t == MAS or t == MAS_REVERSE
-
-    def get_mas_diagnonal_letters(
-        i: int, j: int, row_increment: int, col_increment: int
-    ):
-        return get_diagonal_letters(grid, i, j, row_increment, col_increment, 2)
+def check_xmas_directions_part_two(grid: Grid, i: int) -> int:
+    def is_word(start: int, end: int) -> bool:
+        # MAS or SAM through the A in the middle
+        return (grid[start] == M and grid[end] == S) or (
+            grid[start] == S and grid[end] == M
+        )
 
-    top_bound = i - 1 >= 0
-    bottom_bound = i + 1 < len(grid)
-    right_bound = j + 1 < len(grid[0])
-    left_bound = j - 1 >= 0
-    if top_bound and left_bound and bottom_bound and right_bound:
-        if is_word(get_mas_diagnonal_letters(i - 1, j + 1, 1, -1)) and is_word(
-            get_mas_diagnonal_letters(i - 1, j - 1, 1, 1)
-        ):
-            return 1
+    top_left, top_right, bottom_right, bottom_left = (
+        i + offset for offset in grid.diagonal_offsets
+    )
+    if is_word(top_right, bottom_left) and is_word(top_left, bottom_right):
+        return 1
     return 0
 
 
-def find_xmas(grid: LetterGrid) -> int:
+def find_xmas(grid: Grid) -> int:
     result = 0
-    for i in range(len(grid)):
-        for j in range(len(grid[i])):
-            letter = grid[i][j]
-            if letter == "X":
-                result += check_xmas_directions(grid, i, j)
+    for i in grid.find_all(b"X"):
+        result += check_xmas_directions(grid, i)
     return result
 
 
-def find_xmas_part_two(grid: LetterGrid) -> int:
+def find_xmas_part_two(grid: Grid) -> int:
     result = 0
-    for i in range(len(grid)):
-        for j in range(len(grid[i])):
-            letter = grid[i][j]
-            if letter == "A":
-                result += check_xmas_directions_part_two(grid, i, j)
+    for i in grid.find_all(b"A"):
+        result += check_xmas_directions_part_two(grid, i)
     return result
 
 
+def start_range(size: int, step: int, length: int) -> tuple[int, int]:
+    """Range of the starts along an axis for which the whole word fits."""
+    if step > 0:
+        return 0, size - length + 1
+    if step < 0:
+        return length - 1, size
+    return 0, size
+
+
+def count_words(grid: Grid, words: list[bytes]) -> dict[bytes, int]:
+    """
+    Counts the words in all 8 directions. For every direction the grid is
+    compared with each letter of a word at once, shifting the view of the
+    grid by a step per letter and ANDing the matches of the letters.
+    Words of a single letter are counted once.
+    """
+    letters = grid.as_array()
+    height, width = letters.shape
+    counts: dict[bytes, int] = {}
+    for word in words:
+        if len(word) == 1:
+            counts[word] = int(np.count_nonzero(letters == word[0]))
+            continue
+        count = 0
+        for d_row, d_col in WORD_DIRECTIONS:
+            row_start, row_end = start_range(height, d_row, len(word))
+            col_start, col_end = start_range(width, d_col, len(word))
+            if row_start >= row_end or col_start >= col_end:
+                continue
+            found = None
+            for k, letter in enumerate(word):
+                view = letters[
+                    row_start + k * d_row : row_end + k * d_row,
+                    col_start + k * d_col : col_end + k * d_col,
+                ]
+                found = view == letter if found is None else found & (view == letter)
+            count += int(np.count_nonzero(found))
+        counts[word] = count
+    return counts
+
+
+def symmetries(stencil: Stencil) -> list[Stencil]:
+    """The distinct rotations and reflections of the stencil."""
+    cells = np.array([list(row) for row in stencil], dtype=np.uint8)
+    variants: list[Stencil] = []
+    for k in range(4):
+        rotated = np.rot90(cells, k)
+        for variant in (rotated, np.fliplr(rotated)):
+            rows = tuple(row.tobytes() for row in variant)
+            if rows not in variants:
+                variants.append(rows)
+    return variants
+
+
+def count_stencils(grid: Grid, stencils: list[Stencil]) -> int:
+    """
+    Counts the positions where a stencil matches the grid, WILDCARD cells
+    match any letter. Each cell of a stencil compares a shifted view of the
+    whole grid with its letter, so a new shape is just another stencil.
+    """
+    letters = grid.as_array()
+    height, width = letters.shape
+    count = 0
+    for stencil in stencils:
+        rows, cols = height - len(stencil) + 1, width - len(stencil[0]) + 1
+        if rows <= 0 or cols <= 0:
+            continue
+        found = np.ones((rows, cols), dtype=bool)
+        for r, row in enumerate(stencil):
+            for c, letter in enumerate(row):
+                if letter != WILDCARD:
+                    found &= letters[r : r + rows, c : c + cols] == letter
+        count += int(np.count_nonzero(found))
+    return count
+
+
 if __name__ == "__main__":
-    grid = []
-    with open("input.txt", "r") as file:
-        rows = file.readlines()
-        for row in rows:
-            grid.append([c for c in row])
+    grid = Grid.from_file("input.txt")
 
-    print(f"ROWS: {len(grid)}, COLS={len(grid[0])}")
+    print(f"ROWS: {grid.height}, COLS={grid.width}")
     res = find_xmas(grid)
     print("Result: ", res)
 
@@ -1,91 +1,240 @@
-from typing import cast
+from functools import cmp_to_key
+from typing import NamedTuple
 
+import numpy as np
 
-def process_update(rules: dict[str, list[str]], update: list[str]) -> None | int:
-    update_index = {n: i for i, n in enumerate(update)}
-    for i, n in enumerate(update):
-        if n not in rules:
-            continue
-        for c in rules[n]:
-            index = update_index.get(c)
-            # if index is None the rule dosent apply since page number isnt in the update
-            # if the condition is not before the page number as required by the rule then its not valid
-            if index is not None and index > i:
-                return None
-    return int(update[len(update) // 2])
-
-
-def process_update_with_fixes(
-    rules: dict[str, list[str]], update: list[str]
-) -> None | int:
-    update_index = {n: i for i, n in enumerate(update)}
-    had_error = False
-    i = 0
-    while i < len(update):
-        n = update[i]
-        if n not in rules:
-            i += 1
-            continue
-        for c in rules[n]:
-            index = update_index.get(c)
-            if index is not None and index > i:
-                had_error = True
-                # fix it
-                update[index], update[i] = update[i], update[index]
-                update_index[c], update_index[n] = i, index
-                # substract one to nullify the increment below
-                i -= 1
-                break
-        i += 1
-    return int(update[len(update) // 2]) if had_error else None
+from aoc.parallel import imap_bounded
+from aoc.parsing import IntRecords, read_records
 
+# The pages that have to be printed before each page, in the order of the rules.
+# The dicts are ordered sets: the repair of updates the rules don't fully order
+# depends on that order
+type Rules = dict[int, dict[int, None]]
 
-def solve_part_two(lines: list[str]) -> int:
-    rules = {}
-    result = 0
+# Most rule lookups of the updates of one length checked at once, n updates of
+# length k need n * k * k of them
+BLOCK_LOOKUPS = 1 << 24
+# Updates handed to a worker at a time by solve_parallel
+SHARD_UPDATES = 1 << 17
+
+
+def add_rule(rules: Rules, before: int, after: int):
+    rules.setdefault(after, {})[before] = None
+
+
+def parse_input(lines: list[str]) -> tuple[Rules, list[list[int]]]:
+    rules: Rules = {}
+    updates: list[list[int]] = []
     for line in lines:
         line = line.strip()
         if line == "":
             continue
         if "|" in line:
-            condition = line.split("|")
-            first, second = condition[0], condition[1]
-            if second not in rules:
-                rules[second] = []
-            rules[second].append(first)
+            first, second = line.split("|")
+            add_rule(rules, int(first), int(second))
             continue
-        update = cast(list[str], line.split(","))
+        updates.append([int(n) for n in line.split(",")])
+    return rules, updates
+
+
+def is_ordered(rules: Rules, update: list[int]) -> bool:
+    return all(
+        later not in rules.get(page, ())
+        for i, page in enumerate(update)
+        for later in update[i + 1 :]
+    )
+
+
+def is_totally_ordered(rules: Rules, update: list[int]) -> bool:
+    """Whether the rules order every pair of pages of the update."""
+    return all(
+        later in rules.get(page, ()) or page in rules.get(later, ())
+        for i, page in enumerate(update)
+        for later in update[i + 1 :]
+    )
+
+
+def page_order(rules: Rules):
+    # Only a valid sort key for updates the rules totally order
+    def compare(a: int, b: int) -> int:
+        if a in rules.get(b, ()):
+            return -1
+        if b in rules.get(a, ()):
+            return 1
+        return 0
+
+    return cmp_to_key(compare)
+
+
+def repair_by_swaps(rules: Rules, update: list[int]) -> list[int]:
+    """
+    Swaps the first page that has to be before the page at i but is after it
+    into place, until every page is preceded by the pages it has to be.
+    """
+    update = update[:]
+    index = {page: i for i, page in enumerate(update)}
+    i = 0
+    while i < len(update):
+        page = update[i]
+        for before in rules.get(page, ()):
+            j = index.get(before)
+            if j is not None and j > i:
+                update[i], update[j] = update[j], update[i]
+                index[before], index[page] = i, j
+                break
+        else:
+            i += 1
+    return update
+
+
+def process_update(rules: Rules, update: list[int]) -> None | int:
+    if not is_ordered(rules, update):
+        return None
+    return update[len(update) // 2]
+
+
+def process_update_with_fixes(rules: Rules, update: list[int]) -> None | int:
+    if is_ordered(rules, update):
+        return None
+    if is_totally_ordered(rules, update):
+        # O(k log k) instead of swapping pairs and rescanning
+        return sorted(update, key=page_order(rules))[len(update) // 2]
+    # Pages without a rule between them make the sort depend on the
+    # algorithm, repair them the way the rules are broken instead
+    return repair_by_swaps(rules, update)[len(update) // 2]
+
+
+def solve_part_two(lines: list[str]) -> int:
+    rules, updates = parse_input(lines)
+    result = 0
+    for update in updates:
         if middle_page_num := process_update_with_fixes(rules, update):
             result += middle_page_num
     return result
 
 
 def solve_part_one(lines: list[str]) -> int:
-    rules = {}
+    rules, updates = parse_input(lines)
     result = 0
-    for line in lines:
-        line = line.strip()
-        if line == "":
-            continue
-        if "|" in line:
-            condition = line.split("|")
-            first, second = condition[0], condition[1]
-            if second not in rules:
-                rules[second] = []
-            rules[second].append(first)
-            continue
-        if middle_page_num := process_update(rules, line.split(",")):
+    for update in updates:
+        if middle_page_num := process_update(rules, update):
             result += middle_page_num
     return result
 
 
+class Manual(NamedTuple):
+    # order[a, b] is set when page a has to be printed before page b
+    order: np.ndarray
+    # The page numbers of the page ids used by order, rules and updates
+    pages: np.ndarray
+    # (before, after) page ids in the order of the input
+    rules: np.ndarray
+    updates: IntRecords
+
+
+def read_manual(file_name: str = "input.txt") -> Manual:
+    records = read_records(file_name, signed=False)
+    lengths = records.lengths()
+    # The rules end at the blank line
+    blank = np.flatnonzero(lengths == 0)
+    rules_end = int(blank[0]) if len(blank) else len(records)
+    # Page numbers can be large, the rule index is over the distinct pages
+    pages, ids = np.unique(records.values, return_inverse=True)
+    records = IntRecords(ids, records.offsets)
+    rules = records.values[: records.offsets[rules_end]].reshape(-1, 2)
+    order = np.zeros((len(pages), len(pages)), dtype=bool)
+    order[rules[:, 0], rules[:, 1]] = True
+    updates = records.slice(rules_end, len(records))
+    # Drop the blank lines between the rules and the updates
+    updates = IntRecords(updates.values, np.unique(updates.offsets))
+    return Manual(order, pages, rules, updates)
+
+
+def evaluate_updates(
+    order: np.ndarray, pages: np.ndarray, rules: np.ndarray, updates: IntRecords
+) -> tuple[int, int]:
+    """
+    Both answers from a single check of each update. The ordered updates
+    give part one, the others are the ones part two fixes.
+    """
+    ordered_sum = fixed_sum = 0
+    # Built for the first update the rules don't totally order
+    scalar_rules: Rules | None = None
+    for _, all_ids in updates.by_length():
+        length = all_ids.shape[1]
+        block = max(1, BLOCK_LOOKUPS // (length * length))
+        # later[j, i] is set when position j comes after position i
+        later = np.tri(length, k=-1, dtype=bool)
+        same = np.eye(length, dtype=bool)
+        for start in range(0, len(all_ids), block):
+            ids = all_ids[start : start + block]
+            # precedes[n, i, j] is set when page i of update n has to be
+            # printed before its page j
+            precedes = order[ids[:, :, None], ids[:, None, :]]
+            ordered = ~(precedes & later).any(axis=(1, 2))
+            ordered_sum += int(pages[ids[ordered, length // 2]].sum())
+            broken, precedes = ids[~ordered], precedes[~ordered]
+            # Once fixed the middle page has length // 2 pages before it, no
+            # need to sort the rest. That only holds when the rules order
+            # every pair of pages and aren't cyclic
+            related = precedes | precedes.transpose(0, 2, 1) | same
+            is_middle = precedes.sum(axis=1) == length // 2
+            exact = related.all(axis=(1, 2)) & is_middle.any(axis=1)
+            middle = np.argmax(is_middle[exact], axis=1)
+            fixed_sum += int(pages[broken[exact][np.arange(len(middle)), middle]].sum())
+            for update in broken[~exact].tolist():
+                if scalar_rules is None:
+                    scalar_rules = {}
+                    for before, after in rules.tolist():
+                        add_rule(scalar_rules, before, after)
+                middle_id = process_update_with_fixes(scalar_rules, update)
+                fixed_sum += int(pages[middle_id])
+    return ordered_sum, fixed_sum
+
+
+# The rule index, page numbers and rules of a worker process, set once by
+# share_order
+_shared_order: tuple[np.ndarray, np.ndarray, np.ndarray] | None = None
+
+
+def share_order(order: np.ndarray, pages: np.ndarray, rules: np.ndarray):
+    global _shared_order
+    _shared_order = order, pages, rules
+
+
+def evaluate_shard(updates: IntRecords) -> tuple[int, int]:
+    assert _shared_order is not None
+    return evaluate_updates(*_shared_order, updates)
+
+
+def solve_parallel(
+    manual: Manual, shard_updates: int = SHARD_UPDATES, workers: int | None = None
+) -> tuple[int, int]:
+    """
+    evaluate_updates over shards of the updates in a process pool, the rule
+    index is sent to each worker once instead of with every shard.
+    """
+    shards = (
+        manual.updates.slice(start, start + shard_updates)
+        for start in range(0, len(manual.updates), shard_updates)
+    )
+    ordered_sum = fixed_sum = 0
+    for shard_ordered, shard_fixed in imap_bounded(
+        evaluate_shard,
+        shards,
+        workers,
+        initializer=share_order,
+        initargs=(manual.order, manual.pages, manual.rules),
+    ):
+        ordered_sum += shard_ordered
+        fixed_sum += shard_fixed
+    return ordered_sum, fixed_sum
+
+
 def main():
-    with open("input.txt", "r") as file:
-        lines = file.readlines()
-    result = solve_part_one(lines)
+    result, result_part_two = evaluate_updates(*read_manual())
     print("Result=", result)
-    result = solve_part_two(lines)
-    print("Result part two=", result)
+    print("Result part two=", result_part_two)
 
 
 if __name__ == "__main__":
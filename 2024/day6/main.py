@@ -1,5 +1,11 @@
 import enum
-from typing import NamedTuple
+from array import array
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from aoc.grid import BORDER, DOWN, LEFT, RIGHT, UP, Grid
+from aoc.parallel import imap_bounded
 
 
 class GridSquare(enum.StrEnum):
@@ -32,75 +38,203 @@ class GridSquare(enum.StrEnum):
         )
 
 
-type GridArea = list[list[GridSquare]]
-
-
-class GridPos(NamedTuple):
-    row: int
-    col: int
-
-    def __add__(self, other):
-        assert isinstance(other, GridPos), "Cant add different types."
-        return GridPos(self.row + other.row, self.col + other.col)
-
-
 GUARD_TURN_DIRECTION = {
     GridSquare.GuardUp: GridSquare.GuardRight,
     GridSquare.GuardDown: GridSquare.GuardLeft,
     GridSquare.GuardRight: GridSquare.GuardDown,
     GridSquare.GuardLeft: GridSquare.GuardUp,
 }
-GUARD_VISITED = {
-    GridSquare.GuardUp: GridSquare.GuardVisitedVertical,
-    GridSquare.GuardDown: GridSquare.GuardVisitedVertical,
-    GridSquare.GuardRight: GridSquare.GuardVisitedHorizontal,
-    GridSquare.GuardLeft: GridSquare.GuardVisitedHorizontal,
-}
 
-GUARD_STEP_CHANGE = {
-    GridSquare.GuardUp: GridPos(-1, 0),
-    GridSquare.GuardDown: GridPos(1, 0),
-    GridSquare.GuardRight: GridPos(0, 1),
-    GridSquare.GuardLeft: GridPos(0, -1),
+# The grid stores the squares as bytes
+OBJECT = ord(GridSquare.Object)
+PLACED_OBJECT = ord(GridSquare.PlacedObject)
+PATH = ord(GridSquare.Path)
+START = ord(GridSquare.Start)
+VISITED_VERTICAL = ord(GridSquare.GuardVisitedVertical)
+VISITED_HORIZONTAL = ord(GridSquare.GuardVisitedHorizontal)
+VISITED_BOTH = ord(GridSquare.GuardVisitedBothDirections)
+
+GUARD_DIRECTION = {
+    GridSquare.GuardUp: UP,
+    GridSquare.GuardDown: DOWN,
+    GridSquare.GuardRight: RIGHT,
+    GridSquare.GuardLeft: LEFT,
 }
 
 
+# Visited cells keep a bit per direction the guard was facing there
+VERTICAL_BITS = 1 << UP | 1 << DOWN
+HORIZONTAL_BITS = 1 << RIGHT | 1 << LEFT
+
+
+def visit_mark(bits: int) -> int:
+    if bits & VERTICAL_BITS and bits & HORIZONTAL_BITS:
+        return VISITED_BOTH
+    return VISITED_VERTICAL if bits & VERTICAL_BITS else VISITED_HORIZONTAL
+
+
+# Jump table entry of a guard that walks off the map
+EXIT = -1
+
+
+def build_jump_table(grid: Grid) -> array:
+    """
+    table[direction * len(grid.cells) + pos] is the cell in front of the
+    first obstacle a guard at pos walking in direction runs into, which is pos
+    itself if the guard has to turn right away, or EXIT.
+    """
+    height, width = grid.height, grid.width
+    blocked = grid.as_array() == OBJECT
+    rows = np.arange(height)[:, None]
+    cols = np.arange(width)[None, :]
+    # Index of the nearest obstacle before (after) every cell along its line,
+    # -1 (width or height) if there is none
+    left = np.maximum.accumulate(np.where(blocked, cols, -1), axis=1)
+    left = np.hstack((np.full((height, 1), -1), left[:, :-1]))
+    right = np.minimum.accumulate(np.where(blocked, cols, width)[:, ::-1], axis=1)
+    right = np.hstack((right[:, ::-1][:, 1:], np.full((height, 1), width)))
+    up = np.maximum.accumulate(np.where(blocked, rows, -1), axis=0)
+    up = np.vstack((np.full((1, width), -1), up[:-1]))
+    down = np.minimum.accumulate(np.where(blocked, rows, height)[::-1], axis=0)
+    down = np.vstack((down[::-1][1:], np.full((1, width), height)))
+    stops = {
+        UP: ((up + 1), cols, up == -1),
+        RIGHT: (rows, right - 1, right == width),
+        DOWN: ((down - 1), cols, down == height),
+        LEFT: (rows, left + 1, left == -1),
+    }
+    size = len(grid.cells)
+    table = np.full(4 * size, EXIT, dtype=np.int64)
+    cells = ((rows + 1) * grid.stride + cols).ravel()
+    for direction, (stop_row, stop_col, exits) in stops.items():
+        stop = (stop_row + 1) * grid.stride + stop_col
+        table[direction * size + cells] = np.where(exits, EXIT, stop).ravel()
+    return array("q", table.tobytes())
+
+
+def loops_with_obstacle(
+    table: array | memoryview,
+    stride: int,
+    pos: int,
+    direction: int,
+    obstacle: int,
+    seen: bytearray,
+) -> bool:
+    """
+    Walks from turn to turn with the jump table, so it costs O(turns). The
+    table doesn't know about the placed obstacle, a jump that would pass it
+    is cut short in front of it instead.
+
+    seen holds the direction bits of the turns, it has to be all zero and is
+    cleared again before returning.
+    """
+    offsets = (-stride, 1, stride, -1)
+    size = len(seen)
+    dirty: list[int] = []
+    loop = False
+    while True:
+        stop = table[direction * size + pos]
+        offset = offsets[direction]
+        ahead = (obstacle - pos) * offset
+        if (
+            ahead > 0
+            and (
+                obstacle // stride == pos // stride
+                if direction in (RIGHT, LEFT)
+                else (obstacle - pos) % stride == 0
+            )
+            and (stop == EXIT or (stop - obstacle) * offset >= 0)
+        ):
+            stop = obstacle - offset
+        if stop == EXIT:
+            break
+        bits = seen[stop]
+        if bits & 1 << direction:
+            loop = True
+            break
+        if not bits:
+            dirty.append(stop)
+        seen[stop] = bits | 1 << direction
+        pos, direction = stop, (direction + 1) % 4
+    for pos in dirty:
+        seen[pos] = 0
+    return loop
+
+
+# Candidates handed to a worker at a time by solve_part_two_parallel
+BATCH_CANDIDATES = 256
+
+type Candidate = tuple[int, int, int]
+
+# The shared jump table and the turn bits of a worker, see attach_jump_table
+_worker_state: tuple[SharedMemory, memoryview, int, bytearray] | None = None
+
+
+def attach_jump_table(name: str, size: int, stride: int):
+    global _worker_state
+    try:
+        # Only the process that created the table unlinks it
+        memory = SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13
+        memory = SharedMemory(name=name)
+    table = memory.buf[: 4 * size * 8].cast("q")
+    _worker_state = memory, table, stride, bytearray(size)
+
+
+def find_loops(batch: list[Candidate]) -> list[int]:
+    assert _worker_state is not None
+    _, table, stride, seen = _worker_state
+    return [
+        obstacle
+        for obstacle, guard_pos, direction in batch
+        if loops_with_obstacle(table, stride, guard_pos, direction, obstacle, seen)
+    ]
+
+
 class Map:
 
-    def __init__(self, guard_pos: GridPos, grid: GridArea):
+    def __init__(self, guard_pos: int, grid: Grid):
         self.grid = grid
-        self.rows = len(self.grid)
-        self.cols = len(self.grid[0])
+        self.rows = grid.height
+        self.cols = grid.width
         self.guard_pos = guard_pos
-        self._guard = self[self.guard_pos]
+        self._guard = GridSquare.from_str(chr(self[self.guard_pos]))
         self._guard_start_pos = self.guard_pos
         self._guard_start = self._guard
-        self[self.guard_pos] = GridSquare.Start
-        self.visited: list[tuple[GridPos, GridSquare]] = []
+        self[self.guard_pos] = START
+        # The cells in the order the guard entered them, a cell is added
+        # again when the guard comes back to it
+        self.visited: list[tuple[int, GridSquare]] = []
+        self.seen = bytearray(len(grid.cells))
+        # The cells with bits in seen, in the order of their first visit
+        self.dirty: list[int] = []
 
     def num_visited(self) -> int:
-        return len({p for p, _ in self.visited})
+        return len(self.dirty)
+
+    def reset_visits(self):
+        for pos in self.dirty:
+            self.seen[pos] = 0
+        self.dirty = []
+        self.visited = []
 
     def reset_guard(self):
         self.guard = self._guard_start
         self.guard_pos = self._guard_start_pos
-        self[self.guard_pos] = self.guard
+        self[self.guard_pos] = ord(self.guard)
 
     @classmethod
     def create(cls, input: str) -> "Map":
-        grid = []
-        rows = input.split("\n")
-        guard_pos: GridPos = GridPos(0, 0)
-        for i, row in enumerate(rows):
-            if row.strip() == "":
-                break
-            grid.append([])
-            for j, col in enumerate(row):
-                square = GridSquare.from_str(col)
-                if GridSquare.is_guard(square):
-                    guard_pos = GridPos(i, j)
-                grid[-1].append(square)
-        return cls(guard_pos, grid)
+        return cls.from_grid(Grid.from_text(input))
+
+    @classmethod
+    def from_grid(cls, grid: Grid) -> "Map":
+        for guard in GUARD_DIRECTION:
+            guard_pos = grid.find(guard.encode())
+            if guard_pos != -1:
+                return cls(guard_pos, grid)
+        raise ValueError("No guard on the map")
 
     @property
     def guard(self) -> GridSquare:
@@ -112,43 +246,27 @@ class Map:
         self._guard = value
 
     @property
-    def guard_step(self) -> GridPos:
-        return GUARD_STEP_CHANGE[self.guard]
-
-    def in_bound(self, pos: GridPos) -> bool:
-        return (
-            pos.row < self.rows
-            and pos.row >= 0
-            and pos.col < self.cols
-            and pos.col >= 0
-        )
+    def guard_step(self) -> int:
+        return self.grid.offsets[GUARD_DIRECTION[self.guard]]
 
-    def __getitem__(self, pos: GridPos) -> GridSquare:
-        return self.grid[pos.row][pos.col]
+    def in_bound(self, pos: int) -> bool:
+        return self.grid[pos] != BORDER
 
-    def __setitem__(self, pos: GridPos, item: GridSquare) -> None:
-        self.grid[pos.row][pos.col] = item
+    def __getitem__(self, pos: int) -> int:
+        return self.grid[pos]
 
-    def _get_visit_value(self):
-        return GUARD_VISITED[self.guard]
+    def __setitem__(self, pos: int, item: int) -> None:
+        self.grid[pos] = item
 
     def visit(self) -> bool:
-        current_value = self[self.guard_pos]
-        new_value = self._get_visit_value()
-        if (
-            current_value == GridSquare.GuardVisitedVertical
-            and new_value == GridSquare.GuardVisitedHorizontal
-        ) or (
-            current_value == GridSquare.GuardVisitedHorizontal
-            and new_value == GridSquare.GuardVisitedVertical
-        ):
-            new_value = GridSquare.GuardVisitedBothDirections
-        elif (
-            self.guard_pos,
-            self.guard,
-        ) in self.visited:
+        bit = 1 << GUARD_DIRECTION[self.guard]
+        bits = self.seen[self.guard_pos]
+        # Facing the same way on the same cell again
+        if bits & bit:
             return True
-        self[self.guard_pos] = new_value
+        if not bits:
+            self.dirty.append(self.guard_pos)
+        self.seen[self.guard_pos] = bits | bit
         if len(self.visited) == 0 or self.visited[-1][0] != self.guard_pos:
             self.visited.append((self.guard_pos, self.guard))
         return False
@@ -160,17 +278,14 @@ class Map:
         new_pos = self.guard_pos + self.guard_step
         if not self.in_bound(new_pos):
             self.guard_pos = new_pos
-        elif (
-            self[new_pos] != GridSquare.Object
-            and self[new_pos] != GridSquare.PlacedObject
-        ):
+        elif self[new_pos] != OBJECT and self[new_pos] != PLACED_OBJECT:
             self.guard_pos = new_pos
         else:
             self.guard = GUARD_TURN_DIRECTION[self.guard]
         return False
 
     def walk(self, debug: bool = False) -> bool:
-        self.visited = []
+        self.reset_visits()
         while self.in_bound(self.guard_pos):
             loop = self.step()
             if loop:
@@ -179,45 +294,71 @@ class Map:
                 self.display()
         return False
 
-    def solve_part_two(self, debug: bool = False) -> list[GridPos]:
-        loops = []
-        positions_to_explore = [(pos, v) for pos, v in self.visited]
+    def part_two_candidates(self) -> list[Candidate]:
+        """
+        The (obstacle, guard_pos, direction) to test, the guard starts right
+        before the placed object to reduce steps.
+        """
+        candidates = []
         attempted_positions = set()
-
-        def reset():
-            for pos, _ in self.visited:
-                self[pos] = GridSquare.Path
-            self.visited = []
-
-        for i in range(0, len(positions_to_explore) - 1):
-            object_pos, _ = positions_to_explore[i + 1]
+        for (guard_pos, guard), (object_pos, _) in zip(self.visited, self.visited[1:]):
+            # prevent doing the same work twice
             if object_pos in attempted_positions:
                 continue
-            # prevent doing the same work twice
             attempted_positions.add(object_pos)
-            # Reset map
-            reset()
-            # Move guard to right before placed object to reduce steps.
-            self.guard_pos, self.guard = positions_to_explore[i]
-            # place object
-            self[object_pos] = GridSquare.PlacedObject
-            if self.walk(debug=debug):
-                loops.append(object_pos)
-            self[object_pos] = GridSquare.Path
-        return loops
-
-    def _format_grid(self, grid: GridArea):
-        text_grid = "\n"
-        for i, row in enumerate(grid):
-            for j, col in enumerate(row):
-                v = col
-                if i == self.guard_pos.row and j == self.guard_pos.col:
-                    v = self.guard
-                elif i == self._guard_start_pos.row and j == self._guard_start_pos.col:
-                    v = GridSquare.Start
-                text_grid += v.value
-            text_grid += "\n"
-        return text_grid
+            candidates.append((object_pos, guard_pos, GUARD_DIRECTION[guard]))
+        return candidates
+
+    def solve_part_two(self) -> list[int]:
+        table = build_jump_table(self.grid)
+        seen = bytearray(len(self.grid.cells))
+        return [
+            obstacle
+            for obstacle, guard_pos, direction in self.part_two_candidates()
+            if loops_with_obstacle(
+                table, self.grid.stride, guard_pos, direction, obstacle, seen
+            )
+        ]
+
+    def solve_part_two_parallel(
+        self, workers: int | None = None, batch_size: int = BATCH_CANDIDATES
+    ) -> list[int]:
+        """
+        solve_part_two over batches of candidates in a process pool. The jump
+        table is frozen in shared memory, a worker only owns its turn bits.
+        """
+        table = build_jump_table(self.grid)
+        size = len(self.grid.cells)
+        memory = SharedMemory(create=True, size=len(table) * table.itemsize)
+        try:
+            memory.buf[: len(table) * table.itemsize] = table.tobytes()
+            candidates = self.part_two_candidates()
+            batches = (
+                candidates[i : i + batch_size]
+                for i in range(0, len(candidates), batch_size)
+            )
+            loops = []
+            for batch_loops in imap_bounded(
+                find_loops,
+                batches,
+                workers,
+                initializer=attach_jump_table,
+                initargs=(memory.name, size, self.grid.stride),
+            ):
+                loops.extend(batch_loops)
+            return loops
+        finally:
+            memory.close()
+            memory.unlink()
+
+    def _format_grid(self, grid: Grid):
+        cells = grid.cells[:]
+        for pos in self.dirty:
+            cells[pos] = visit_mark(self.seen[pos])
+        cells[self._guard_start_pos] = START
+        if self.in_bound(self.guard_pos):
+            cells[self.guard_pos] = ord(self.guard)
+        return "\n" + cells[grid.stride : -grid.stride].decode()
 
     def display(self):
         print("===============================")
@@ -226,9 +367,33 @@ class Map:
         print(text_grid)
 
 
+EXAMPLE = [
+    "....#.....",
+    ".........#",
+    "..........",
+    "..#.......",
+    ".......#..",
+    "..........",
+    ".#..^.....",
+    "........#.",
+    "#.........",
+    "......#...",
+]
+
+
+def test_example():
+    map = Map.create("\n".join(EXAMPLE))
+    map.walk()
+    assert map.num_visited() == 41
+    assert len(map.solve_part_two()) == 6
+
+
+def run_tests():
+    test_example()
+
+
 def main():
-    with open("input.txt", "r") as file:
-        map = Map.create(file.read())
+    map = Map.from_grid(Grid.from_file("input.txt"))
     map.walk(debug=False)
     result = map.num_visited()
     print("Result: ", result)
@@ -237,4 +402,5 @@ def main():
 
 
 if __name__ == "__main__":
+    run_tests()
     main()
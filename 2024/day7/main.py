@@ -1,5 +1,16 @@
+import sys
+import time
 from typing import Callable, NamedTuple
-import math
+
+from aoc.parallel import imap_bounded
+from aoc.parsing import IntRecords, parse_records, read_line_chunks, read_records
+
+CHUNK_BYTES = 1 << 20
+# Equations with at least this many numbers are split in the middle
+LONG_EQUATION = 20
+# Most values a half of a split equation may reach before it falls back to the
+# depth first search
+MAX_VALUES = 1 << 20
 
 
 class Equation(NamedTuple):
@@ -18,9 +29,25 @@ def parse_equations(lines: list[str]):
     return equations
 
 
+def to_equations(records: IntRecords) -> list[Equation]:
+    return [Equation(numbers[0], numbers[1:]) for numbers in records.tolist()]
+
+
+def read_equations(file_name: str = "input.txt") -> list[Equation]:
+    return to_equations(read_records(file_name, signed=False))
+
+
+def digits_power(n: int) -> int:
+    """The power of 10 above n, exact unlike 10 ** (log10(n) + 1)."""
+    power = 10
+    while power <= n:
+        power *= 10
+    return power
+
+
 def concat_numbers(a: int, b: int) -> int:
     # return int(str(n1) + str(n2))
-    return a * 10 ** (math.floor(math.log10(b)) + 1) + b
+    return a * digits_power(b) + b
 
 
 type Operation = Callable[[int, int], int]
@@ -32,6 +59,211 @@ OPERATIONS: list[Operation] = [
 ]
 
 
+class Operator(NamedTuple):
+    apply: Operation
+    # The left operand given the result and the right operand, None if no
+    # left operand gives that result
+    undo: Callable[[int, int], int | None]
+
+
+def undo_add(result: int, x: int) -> int | None:
+    return result - x if result >= x else None
+
+
+def undo_mul(result: int, x: int) -> int | None:
+    return result // x if x != 0 and result % x == 0 else None
+
+
+def undo_concat(result: int, x: int) -> int | None:
+    power = digits_power(x)
+    return result // power if result % power == x else None
+
+
+ADD = Operator(lambda y, x: y + x, undo_add)
+MUL = Operator(lambda y, x: y * x, undo_mul)
+CONCAT = Operator(concat_numbers, undo_concat)
+
+PART_ONE_OPERATORS = (ADD, MUL)
+PART_TWO_OPERATORS = (ADD, MUL, CONCAT)
+
+
+def is_solvable(
+    target: int, numbers: list[int], operators: tuple[Operator, ...]
+) -> bool:
+    """
+    Undoes the operators from the last number back, most operators can only
+    be undone for few results, e.g. * only when the number divides it, so
+    the search mostly follows a single path.
+    """
+
+    def solve(result: int, p: int) -> bool:
+        if p == 0:
+            return result == numbers[0]
+        for operator in operators:
+            previous = operator.undo(result, numbers[p])
+            if previous is not None and solve(previous, p - 1):
+                return True
+        return False
+
+    return solve(target, len(numbers) - 1)
+
+
+def forward_values(
+    limit: int,
+    numbers: list[int],
+    operators: tuple[Operator, ...],
+    max_values: int,
+) -> set[int] | None:
+    """
+    The values numbers can reach up to limit, the operators never make a
+    value smaller. None if there are more than max_values of them.
+    """
+    values = {numbers[0]}
+    for x in numbers[1:]:
+        values = {
+            result
+            for value in values
+            for operator in operators
+            if (result := operator.apply(value, x)) <= limit
+        }
+        if len(values) > max_values:
+            return None
+    return values
+
+
+def backward_values(
+    values: set[int],
+    numbers: list[int],
+    operators: tuple[Operator, ...],
+    max_values: int,
+) -> set[int] | None:
+    """
+    The values that numbers turn into one of values, None if there are more
+    than max_values of them.
+    """
+    for x in reversed(numbers):
+        values = {
+            previous
+            for value in values
+            for operator in operators
+            if (previous := operator.undo(value, x)) is not None
+        }
+        if len(values) > max_values:
+            return None
+    return values
+
+
+def meet_in_the_middle(
+    target: int,
+    numbers: list[int],
+    operators: tuple[Operator, ...],
+    max_values: int = MAX_VALUES,
+) -> bool | None:
+    """
+    Solves the right half backwards from target and the left half forwards,
+    the equation is solvable if both reach a common value. None if a half
+    reaches more than max_values values.
+    """
+    middle = (len(numbers) + 1) // 2
+    backward = backward_values({target}, numbers[middle:], operators, max_values)
+    # The undos usually leave few values, keep moving the middle left while
+    # they are fewer than the forward values of the left half could be
+    while (
+        backward is not None
+        and middle > 1
+        and 0 < len(backward) < len(operators) ** (middle - 1)
+    ):
+        middle -= 1
+        backward = backward_values(
+            backward, numbers[middle : middle + 1], operators, max_values
+        )
+    if backward is None:
+        return None
+    if not backward:
+        return False
+    # Only forward values up to the largest backward value can meet it
+    forward = forward_values(max(backward), numbers[:middle], operators, max_values)
+    if forward is None:
+        return None
+    return not forward.isdisjoint(backward)
+
+
+def solvable(
+    target: int,
+    numbers: list[int],
+    operators: tuple[Operator, ...],
+    long_equation: int = LONG_EQUATION,
+    max_values: int = MAX_VALUES,
+) -> bool:
+    if len(numbers) >= long_equation:
+        result = meet_in_the_middle(target, numbers, operators, max_values)
+        if result is not None:
+            return result
+    return is_solvable(target, numbers, operators)
+
+
+def solve_equations_backward(
+    equations: list[Equation],
+    operators: tuple[Operator, ...] = PART_TWO_OPERATORS,
+    long_equation: int = LONG_EQUATION,
+    max_values: int = MAX_VALUES,
+) -> int:
+    return sum(
+        e.target
+        for e in equations
+        if solvable(e.target, e.numbers, operators, long_equation, max_values)
+    )
+
+
+class ChunkResult(NamedTuple):
+    equations: int
+    part_one: int
+    part_two: int
+
+
+def solve_chunk(chunk: bytes) -> ChunkResult:
+    equations = to_equations(parse_records(chunk, signed=False))
+    part_one = part_two = 0
+    for target, numbers in equations:
+        if solvable(target, numbers, PART_ONE_OPERATORS):
+            part_one += target
+            part_two += target
+        elif solvable(target, numbers, PART_TWO_OPERATORS):
+            part_two += target
+    return ChunkResult(len(equations), part_one, part_two)
+
+
+def solve_file(
+    file_name: str = "input.txt",
+    chunk_bytes: int = CHUNK_BYTES,
+    workers: int | None = None,
+    verbose: bool = False,
+) -> tuple[int, int]:
+    """
+    Solves both parts reading the file a chunk at a time and solving the
+    chunks in a process pool. An equation solvable with + and * is solvable
+    for part two too, so those skip the second search.
+
+    With verbose the running throughput is printed to stderr as the chunks
+    complete.
+    """
+    start = time.perf_counter()
+    equations = part_one = part_two = 0
+    for result in imap_bounded(
+        solve_chunk, read_line_chunks(file_name, chunk_bytes), workers
+    ):
+        equations += result.equations
+        part_one += result.part_one
+        part_two += result.part_two
+        if verbose:
+            elapsed = time.perf_counter() - start
+            print(
+                f"{equations} equations, {equations / elapsed:.0f} equations/s",
+                file=sys.stderr,
+            )
+    return part_one, part_two
+
+
 def solve_equations(equations: list[Equation]):
     def solve(target: int, curr: int, numbers: list[int], p: int):
         if curr > target:
@@ -51,11 +283,9 @@ def solve_equations(equations: list[Equation]):
 
 
 def main():
-    with open("input.txt") as file:
-        lines = file.readlines()
-        equations = parse_equations(lines)
-    res = solve_equations(equations)
-    print("RESULT IS: ", res)
+    part_one, part_two = solve_file(verbose=True)
+    print("RESULT IS: ", part_one)
+    print("RESULT PART TWO IS: ", part_two)
 
 
 if __name__ == "__main__":
@@ -1,74 +1,160 @@
-from typing import NamedTuple
 import itertools
 
+import numpy as np
 
-class Pos(NamedTuple):
-    row: int
-    col: int
+from aoc.grid import Grid
 
-    def __sub__(self, other: "Pos"):
-        return Pos(self.row - other.row, self.col - other.col)
+EMPTY = ord(".")
+# Most antenna pairs whose antinodes are computed at once
+PAIR_BLOCK = 1 << 20
+# Lines at least this long are written as a slice each
+SLICE_LENGTH = 64
 
-    def __add__(self, other):
-        return Pos(self.row + other.row, self.col + other.col)
 
-
-def parse_grid(lines: list[str]):
-    grid = []
-    symbols: dict[str, list[Pos]] = {}
-    for i, row in enumerate(lines):
-        if row == "":
+def find_symbols(grid: Grid) -> dict[int, list[int]]:
+    symbols: dict[int, list[int]] = {}
+    for i in grid.indices():
+        c = grid[i]
+        if c == EMPTY:
             continue
-        grid.append([])
-        for j, c in enumerate(row):
-            grid[-1].append(c)
-            if c == ".":
-                continue
-            if c not in symbols:
-                symbols[c] = []
-            symbols[c].append(Pos(i, j))
-
-    return symbols, grid
+        if c not in symbols:
+            symbols[c] = []
+        symbols[c].append(i)
+    return symbols
 
 
 def find_antinodes(
-    symbols: dict[str, list[Pos]], grid: list[list[str]], extend_antinodes: bool = False
-):
-    def in_bounds(p: Pos) -> bool:
-        return (
-            p.row < len(grid) and p.row >= 0 and p.col < len(grid[p.row]) and p.col >= 0
-        )
-
-    antinodes: set[Pos] = set()
+    symbols: dict[int, list[int]], grid: Grid, extend_antinodes: bool = False
+) -> set[int]:
+    antinodes: set[int] = set()
     for positions in symbols.values():
         for p1, p2 in itertools.combinations(positions, 2):
-            vec1 = p1 - p2
-            vec2 = p2 - p1
+            # Steps can wrap around the rows of the flat grid, so they are taken
+            # on the row and column instead of the cell index
+            row1, col1 = grid.pos(p1)
+            row2, col2 = grid.pos(p2)
+            d_row, d_col = row1 - row2, col1 - col2
             if not extend_antinodes:
-                a1 = p1 + vec1
-                a2 = p2 + vec2
-                if in_bounds(a1):
-                    antinodes.add(a1)
-                if in_bounds(a2):
-                    antinodes.add(a2)
+                if grid.in_bounds(row1 + d_row, col1 + d_col):
+                    antinodes.add(grid.index(row1 + d_row, col1 + d_col))
+                if grid.in_bounds(row2 - d_row, col2 - d_col):
+                    antinodes.add(grid.index(row2 - d_row, col2 - d_col))
                 continue
-            while in_bounds(p1):
-                antinodes.add(p1)
-                p1 += vec1
-            while in_bounds(p2):
-                antinodes.add(p2)
-                p2 += vec2
+            while grid.in_bounds(row1, col1):
+                antinodes.add(grid.index(row1, col1))
+                row1, col1 = row1 + d_row, col1 + d_col
+            while grid.in_bounds(row2, col2):
+                antinodes.add(grid.index(row2, col2))
+                row2, col2 = row2 - d_row, col2 - d_col
     return antinodes
 
 
+def find_frequencies(grid: Grid) -> list[np.ndarray]:
+    """The (2, antennas) array of the rows and columns of each frequency."""
+    cells = grid.as_array()
+    rows, cols = np.nonzero(cells != EMPTY)
+    symbols = cells[rows, cols]
+    order = np.argsort(symbols, kind="stable")
+    positions = np.stack((rows, cols)).astype(np.int32)[:, order]
+    _, starts = np.unique(symbols[order], return_index=True)
+    return np.split(positions, starts[1:], axis=1)
+
+
+def antinode_map(frequencies: list[np.ndarray], height: int, width: int) -> np.ndarray:
+    """Boolean (height, width) map of the antinodes of every antenna pair."""
+    antinodes = np.zeros(height * width, dtype=bool)
+    for rows, cols in frequencies:
+        count = len(rows)
+        block = max(1, PAIR_BLOCK // max(1, count))
+        for start in range(0, count, block):
+            stop = min(start + block, count)
+            # The antinode beyond the first antenna of every (first, second)
+            # pair, the other antinode of the pair is the one of (second, first)
+            node_rows = 2 * rows[start:stop, None] - rows[None]
+            node_cols = 2 * cols[start:stop, None] - cols[None]
+            # An antenna paired with itself is moved off the map
+            node_rows[np.arange(stop - start), np.arange(start, stop)] = -1
+            # Negative values wrap around to big unsigned ones
+            inside = (node_rows.view(np.uint32) < height) & (
+                node_cols.view(np.uint32) < width
+            )
+            antinodes[node_rows[inside] * width + node_cols[inside]] = True
+    return antinodes.reshape(height, width)
+
+
+def step_range(
+    start: np.ndarray, step: np.ndarray, size: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    The first and last t with 0 <= start + t * step < size, steps of 0 get a
+    range wider than any map.
+    """
+    distance = np.abs(step)
+    divisor = np.maximum(distance, 1)
+    # -(a // b) is the ceiling of -a / b
+    low = np.where(step > 0, -(start // divisor), -((size - 1 - start) // divisor))
+    high = np.where(step > 0, (size - 1 - start) // divisor, start // divisor)
+    unbounded = distance == 0
+    low[unbounded] = np.iinfo(np.int32).min
+    high[unbounded] = np.iinfo(np.int32).max
+    return low, high
+
+
+def resonant_antinode_map(
+    frequencies: list[np.ndarray], height: int, width: int
+) -> np.ndarray:
+    """
+    Boolean (height, width) map of the cells in line with any antenna pair.
+
+    Each line is computed rather than walked: its step is the pair difference,
+    as in find_antinodes, and the range of in bounds steps follows from the
+    bounds of the row and the column. On the flat map a line is then a single
+    strided slice.
+    """
+    antinodes = np.zeros(height * width, dtype=bool)
+    for rows, cols in frequencies:
+        count = len(rows)
+        block = max(1, PAIR_BLOCK // max(1, count))
+        for start in range(0, count, block):
+            stop = min(start + block, count)
+            later = np.arange(start, stop)[:, None] < np.arange(count)
+            d_rows = (rows[None] - rows[start:stop, None])[later].astype(np.int64)
+            d_cols = (cols[None] - cols[start:stop, None])[later].astype(np.int64)
+            first_rows = np.broadcast_to(rows[start:stop, None], later.shape)[later]
+            first_cols = np.broadcast_to(cols[start:stop, None], later.shape)[later]
+            # Lines go down the map, or right along a row, so the slice step
+            # on the flat map is positive
+            sign = np.where((d_rows < 0) | ((d_rows == 0) & (d_cols < 0)), -1, 1)
+            d_rows, d_cols = d_rows * sign, d_cols * sign
+            row_low, row_high = step_range(first_rows, d_rows, height)
+            col_low, col_high = step_range(first_cols, d_cols, width)
+            low = np.maximum(row_low, col_low)
+            high = np.minimum(row_high, col_high)
+            starts = (first_rows + low * d_rows) * width + first_cols + low * d_cols
+            steps = d_rows * width + d_cols
+            lengths = high - low + 1
+            # Short lines are written together, a slice per line would cost
+            # more than the cells it writes
+            short = lengths < SLICE_LENGTH
+            cells = np.repeat(starts[short], lengths[short])
+            line_offsets = np.cumsum(lengths[short]) - lengths[short]
+            ranks = np.arange(len(cells)) - np.repeat(line_offsets, lengths[short])
+            antinodes[cells + ranks * np.repeat(steps[short], lengths[short])] = True
+            # Pairs on the same line give the same slice
+            lines = np.unique(np.stack((starts, steps, lengths))[:, ~short], axis=1)
+            for line_start, step, length in lines.T.tolist():
+                line_end = line_start + (length - 1) * step + 1
+                antinodes[line_start:line_end:step] = True
+    return antinodes.reshape(height, width)
+
+
 def main():
-    with open("input.txt") as file:
-        lines = file.read().split("\n")
-        symbols, grid = parse_grid(lines)
-        antinodes = find_antinodes(symbols, grid, extend_antinodes=False)
-        print("RESULT: ", len(antinodes))
-        antinodes = find_antinodes(symbols, grid, extend_antinodes=True)
-        print("RESULT PART TWO: ", len(antinodes))
+    grid = Grid.from_file("input.txt")
+    symbols = find_symbols(grid)
+    antinodes = find_antinodes(symbols, grid, extend_antinodes=False)
+    print("RESULT: ", len(antinodes))
+    antinodes = find_antinodes(symbols, grid, extend_antinodes=True)
+    print("RESULT PART TWO: ", len(antinodes))
 
 
 if __name__ == "__main__":
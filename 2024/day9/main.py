@@ -1,3 +1,9 @@
+import heapq
+
+# Files and gaps are described by a single digit
+MAX_LENGTH = 9
+
+
 def convert(input: str):
     blocks = []
     for i in range(0, len(input), 2):
@@ -78,16 +84,124 @@ def calculate_checksum(blocks: list[str]) -> int:
     return res
 
 
+def run_checksum(file_id: int, start: int, length: int) -> int:
+    """Checksum of length blocks of file_id from block start on."""
+    return file_id * (length * start + length * (length - 1) // 2)
+
+
+def compact_checksum(disk: str) -> int:
+    """
+    The checksum move_blocks gives, computed from the disk map directly: the
+    left pointer walks the files and gaps in order, while the right pointer
+    takes the blocks that fill the gaps from the last file backwards.
+    """
+    checksum = position = 0
+    left, right = 0, len(disk) - 1
+    right -= right % 2
+    remaining = int(disk[right]) if disk else 0
+    while left < right:
+        length = int(disk[left])
+        if left % 2 == 0:
+            checksum += run_checksum(left // 2, position, length)
+            position += length
+        else:
+            while length and left < right:
+                moved = min(length, remaining)
+                checksum += run_checksum(right // 2, position, moved)
+                position += moved
+                length -= moved
+                remaining -= moved
+                if remaining == 0:
+                    right -= 2
+                    remaining = int(disk[right])
+        left += 1
+    # The blocks of the last file that weren't moved
+    if left == right:
+        checksum += run_checksum(right // 2, position, remaining)
+    return checksum
+
+
+def segment_checksum(disk: str) -> int:
+    """
+    The checksum move_blocks_part_two gives, computed on (start, length)
+    segments. The gap starts are kept in a min-heap per gap length, so the
+    leftmost gap a file fits in is the smallest start at the top of the heaps
+    of its length and up.
+    """
+    files: list[tuple[int, int]] = []
+    # Indexed by gap length, MAX_LENGTH holds all the gaps of at least that
+    # length, which fit any file
+    gaps: list[list[int]] = [[] for _ in range(MAX_LENGTH + 1)]
+    gap_ends: dict[int, int] = {}
+    position = gap_start = 0
+    for i, digit in enumerate(disk):
+        length = int(digit)
+        if i % 2 == 1:
+            position += length
+            continue
+        # Gaps on both sides of empty files are a single gap
+        if length and position > gap_start:
+            # Appended in increasing order, which is already a heap
+            gaps[min(position - gap_start, MAX_LENGTH)].append(gap_start)
+            gap_ends[gap_start] = position
+        files.append((position, length))
+        if length:
+            position += length
+            gap_start = position
+
+    checksum = 0
+    for file_id in range(len(files) - 1, -1, -1):
+        start, length = files[file_id]
+        # Only gaps left of the file can take it
+        best, best_start = 0, start
+        for gap_length in range(max(length, 1), MAX_LENGTH + 1):
+            heap = gaps[gap_length]
+            if heap and heap[0] < best_start:
+                best, best_start = gap_length, heap[0]
+        if length and best:
+            heapq.heappop(gaps[best])
+            end = gap_ends.pop(best_start)
+            if end - best_start > length:
+                rest = best_start + length
+                heapq.heappush(gaps[min(end - rest, MAX_LENGTH)], rest)
+                gap_ends[rest] = end
+            start = best_start
+        checksum += run_checksum(file_id, start, length)
+    return checksum
+
+
+EXAMPLE = "2333133121414131402"
+# Checked against the block lists, the last one has file ids past 9
+DISKS = [EXAMPLE, "12345", "14113", "90919", "233313312141413140211"]
+
+
+def test_example_part_1():
+    assert compact_checksum(EXAMPLE) == 1928
+    for disk in DISKS:
+        assert compact_checksum(disk) == calculate_checksum(move_blocks(convert(disk)))
+
+
+def test_example_part_2():
+    assert segment_checksum(EXAMPLE) == 2858
+    for disk in DISKS:
+        expected = calculate_checksum(move_blocks_part_two(convert(disk)))
+        assert segment_checksum(disk) == expected
+
+
+def run_tests():
+    test_example_part_1()
+    test_example_part_2()
+
+
 def main():
     with open("input.txt") as file:
         input = file.read().strip()
-        blocks = move_blocks(convert(input))
-        res = calculate_checksum(blocks)
+        res = compact_checksum(input)
         print("RESULT: ", res)
-        blocks = move_blocks_part_two(convert(input))
-        res = calculate_checksum(blocks)
+        res = segment_checksum(input)
         print("RESULT PART TWO: ", res)
 
 
 if __name__ == "__main__":
+    run_tests()
     main()
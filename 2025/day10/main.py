@@ -1,4 +1,4 @@
-from typing import NamedTuple
+from typing import Iterable, NamedTuple
 import z3
 
 
@@ -8,9 +8,6 @@ class Machine(NamedTuple):
     target: list[int]
 
 
-machines = []
-
-
 def make_bit_map(button: list[int], n: int) -> list[int]:
     map = [0 for _ in range(n)]
     for x in button:
@@ -18,8 +15,9 @@ def make_bit_map(button: list[int], n: int) -> list[int]:
     return map
 
 
-def parse_machines():
-    for line in open(0):
+def parse_machines(lines: Iterable[str]) -> list[Machine]:
+    machines = []
+    for line in lines:
         if not line.strip():
             continue
         parts = line.split(" ")
@@ -90,7 +88,7 @@ def solve_part_2(machine: Machine):
 
 
 def main():
-    machines = parse_machines()
+    machines = parse_machines(open(0))
     answer1 = 0
     answer2 = 0
     for m in machines:
@@ -100,4 +98,5 @@ def main():
     print("answer2: ", answer2)
 
 
-main()
+if __name__ == "__main__":
+    main()
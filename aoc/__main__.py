@@ -0,0 +1,103 @@
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from aoc import bench, generators, runner
+
+
+def add_day_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("year", type=int)
+    parser.add_argument("day", type=int)
+    parser.add_argument("--variant", default="default")
+
+
+def run_command(args: argparse.Namespace):
+    report = runner.run(
+        args.year, args.day, path=args.input, repeat=args.repeat, variant=args.variant
+    )
+    print(json.dumps(report, indent=2))
+
+
+def generate_command(args: argparse.Namespace):
+    text = generators.generate(args.year, args.day, args.size, seed=args.seed)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(text)
+    else:
+        sys.stdout.write(text)
+
+
+def bench_command(args: argparse.Namespace):
+    cases = bench.build_cases(args.days, args.sizes, args.variant)
+    ok = bench.bench(
+        cases,
+        baseline_path=args.baseline,
+        update=args.update,
+        threshold=args.threshold,
+        min_time=args.min_time,
+        repeat=args.repeat,
+        timeout=args.timeout,
+    )
+    sys.exit(0 if ok else 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="aoc", description="Run and time the advent of code solutions."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="time the phases of a day")
+    add_day_arguments(run_parser)
+    run_parser.add_argument("--input", help="defaults to <year>/day<day>/input.txt")
+    run_parser.add_argument("--repeat", type=int, default=1)
+    run_parser.set_defaults(func=run_command)
+
+    generate_parser = commands.add_parser(
+        "generate", help="write a synthetic input of the given size"
+    )
+    generate_parser.add_argument("year", type=int)
+    generate_parser.add_argument("day", type=int)
+    generate_parser.add_argument("--size", type=int, required=True)
+    generate_parser.add_argument("--seed", type=int, default=0)
+    generate_parser.add_argument("--output", help="defaults to stdout")
+    generate_parser.set_defaults(func=generate_command)
+
+    bench_parser = commands.add_parser(
+        "bench", help="compare generated input ladders against a baseline"
+    )
+    bench_parser.add_argument(
+        "--days",
+        nargs="+",
+        type=bench.parse_day,
+        help="e.g. 2024:6, defaults to every day with a ladder",
+    )
+    bench_parser.add_argument("--sizes", nargs="+", type=int)
+    bench_parser.add_argument("--variant", default="default")
+    bench_parser.add_argument("--baseline", type=Path, default=bench.DEFAULT_BASELINE)
+    bench_parser.add_argument(
+        "--update", action="store_true", help="write the results to the baseline"
+    )
+    bench_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=1.5,
+        help="fail when a case takes longer than threshold times its baseline",
+    )
+    bench_parser.add_argument(
+        "--min-time",
+        type=float,
+        default=0.05,
+        help="ignore slowdowns of less than this many seconds",
+    )
+    bench_parser.add_argument("--repeat", type=int, default=3)
+    bench_parser.add_argument("--timeout", type=float, default=600)
+    bench_parser.set_defaults(func=bench_command)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""
+Runs the solutions over a ladder of generated input sizes and compares the
+results with a stored JSON baseline, so a solution going quadratic shows up as
+a failing (day, size) pair.
+"""
+
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from aoc import generators
+from aoc.runner import REPO_ROOT
+
+DEFAULT_BASELINE = REPO_ROOT / "benchmarks" / "baseline.json"
+
+# Sizes are in the unit of each day's generator, see aoc.generators.y2024
+LADDERS: dict[tuple[int, int], list[int]] = {
+    (2024, 1): [1_000, 10_000, 100_000],
+    (2024, 2): [1_000, 10_000, 100_000],
+    (2024, 3): [1_000, 10_000, 100_000],
+    (2024, 4): [100, 200, 400],
+    (2024, 5): [100, 1_000, 10_000],
+    (2024, 6): [50, 100, 200],
+    (2024, 7): [100, 1_000, 5_000],
+    (2024, 8): [50, 100, 200],
+    (2024, 9): [1_001, 10_001, 100_001],
+    (2024, 10): [50, 100, 200],
+    (2024, 11): [10, 100, 1_000],
+    (2024, 12): [50, 100, 200],
+    (2024, 13): [100, 1_000, 10_000],
+    (2024, 14): [500, 1_000],
+    (2024, 15): [20, 50, 100],
+    (2024, 16): [21, 51, 101],
+    (2024, 17): [8, 12, 16],
+    (2024, 18): [71, 101, 141],
+    (2024, 19): [100, 400, 1_000],
+    (2024, 20): [51, 101, 141],
+}
+
+
+class Case(NamedTuple):
+    year: int
+    day: int
+    size: int
+    variant: str = "default"
+
+    @property
+    def key(self) -> str:
+        return f"{self.year}/{self.day}/{self.variant}/{self.size}"
+
+
+def run_case(
+    case: Case, directory: str, repeat: int, timeout: float, seed: int = 0
+) -> dict[str, Any]:
+    path = str(Path(directory) / f"{case.year}_{case.day}_{case.size}.txt")
+    generators.write_input(case.year, case.day, case.size, path, seed=seed)
+    # A fresh process per case keeps the peak RSS of the cases apart
+    command = [sys.executable, "-m", "aoc", "run", str(case.year), str(case.day)]
+    command += ["--input", path, "--repeat", str(repeat), "--variant", case.variant]
+    result = subprocess.run(
+        command,
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        timeout=timeout,
+        check=True,
+    )
+    report = json.loads(result.stdout)
+    return {
+        "wall_time": sum(phase["median"] for phase in report["phases"].values()),
+        "peak_rss_kb": report["peak_rss_kb"],
+        "children_peak_rss_kb": report["children_peak_rss_kb"],
+        "phases": report["phases"],
+        "answers": report["answers"],
+    }
+
+
+def compare(
+    entry: dict[str, Any],
+    baseline: dict[str, Any] | None,
+    threshold: float,
+    min_time: float,
+) -> list[str]:
+    if baseline is None:
+        return []
+    problems = []
+    slowdown = entry["wall_time"] - baseline["wall_time"]
+    # Tiny timings are mostly noise, only flag slowdowns that are big in both senses
+    if entry["wall_time"] > baseline["wall_time"] * threshold and slowdown > min_time:
+        problems.append(
+            f"slower: {entry['wall_time']:.3f}s vs {baseline['wall_time']:.3f}s"
+        )
+    if entry["answers"] != baseline["answers"]:
+        problems.append(f"answers: {entry['answers']} vs {baseline['answers']}")
+    return problems
+
+
+def load_baseline(path: Path) -> dict[str, Any]:
+    if not path.exists():
+        return {}
+    with open(path, "r") as file:
+        return json.load(file)
+
+
+def save_baseline(path: Path, results: dict[str, Any]):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as file:
+        json.dump(results, file, indent=2, sort_keys=True)
+        file.write("\n")
+
+
+def bench(
+    cases: list[Case],
+    baseline_path: Path = DEFAULT_BASELINE,
+    update: bool = False,
+    threshold: float = 1.5,
+    min_time: float = 0.05,
+    repeat: int = 3,
+    timeout: float = 600,
+) -> bool:
+    """
+    Returns False if any case got slower than threshold times its baseline or
+    changed its answers. The baseline is written when it doesn't exist yet or
+    when update is set, keeping the entries of cases that weren't run.
+    """
+    baseline = load_baseline(baseline_path)
+    results: dict[str, Any] = {}
+    ok = True
+    with tempfile.TemporaryDirectory() as directory:
+        for case in cases:
+            try:
+                entry = run_case(case, directory, repeat, timeout)
+            except (subprocess.CalledProcessError, subprocess.TimeoutExpired) as e:
+                print(f"{case.key}: FAILED {e}")
+                ok = False
+                continue
+            results[case.key] = entry
+            problems = compare(entry, baseline.get(case.key), threshold, min_time)
+            ok = ok and not problems
+            status = "REGRESSION " + ", ".join(problems) if problems else "ok"
+            print(
+                f"{case.key}: {entry['wall_time']:.3f}s "
+                f"{entry['peak_rss_kb'] / 1024:.1f}MB "
+                f"(workers {entry['children_peak_rss_kb'] / 1024:.1f}MB) {status}"
+            )
+    if update or not baseline:
+        save_baseline(baseline_path, {**baseline, **results})
+        print(f"Baseline written to {baseline_path}")
+    return ok
+
+
+def parse_day(day: str) -> tuple[int, int]:
+    # "2024:6" or "2024/6"
+    year, _, day_number = day.replace("/", ":").partition(":")
+    return int(year), int(day_number)
+
+
+def build_cases(
+    days: list[tuple[int, int]] | None = None,
+    sizes: list[int] | None = None,
+    variant: str = "default",
+) -> list[Case]:
+    return [
+        Case(year, day, size, variant)
+        for year, day in days or list(LADDERS)
+        for size in sizes or LADDERS[(year, day)]
+    ]
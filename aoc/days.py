@@ -0,0 +1,423 @@
+"""
+Solver registrations, every day is split up into a parse phase and the two parts
+using the functions of the day's own module.
+"""
+
+from aoc.grid import Grid
+from aoc.parsing import read_records
+from aoc.runner import Solver, load_day, read_lines, read_text, solver
+
+
+@solver(2024, 1)
+def day1():
+    m = load_day(2024, 1)
+
+    def part_one(data):
+        left, right, _ = data
+        # calculate_sum pops from the heaps
+        return m.calculate_sum(list(left), list(right))
+
+    def part_two(data):
+        left, _, right_counter = data
+        return m.calculate_score(left, right_counter)
+
+    return Solver(
+        parse=m.read_location_ids,
+        part_one=part_one,
+        part_two=part_two,
+    )
+
+
+@solver(2024, 1, "numpy")
+def day1_numpy():
+    m = load_day(2024, 1)
+    return Solver(
+        parse=m.read_columns,
+        part_one=lambda columns: m.calculate_sum_numpy(*columns),
+        part_two=lambda columns: m.calculate_score_numpy(*columns),
+    )
+
+
+@solver(2024, 1, "chunked")
+def day1_chunked():
+    m = load_day(2024, 1)
+    # The parse phase sorts the input into runs on disk, the parts merge them
+    return Solver(
+        parse=m.spill_sorted_runs,
+        part_one=m.calculate_sum_chunked,
+        part_two=m.calculate_score_chunked,
+    )
+
+
+@solver(2024, 2)
+def day2():
+    m = load_day(2024, 2)
+    return Solver(
+        parse=m.read_reports,
+        part_one=lambda reports: len(
+            m.find_safe_reports(reports, m.is_level_safe_default)
+        ),
+        part_two=lambda reports: len(
+            m.find_safe_reports(reports, m.is_level_safe_with_removal)
+        ),
+    )
+
+
+@solver(2024, 2, "numpy")
+def day2_numpy():
+    m = load_day(2024, 2)
+    return Solver(
+        parse=read_records,
+        part_one=lambda reports: len(m.find_safe_reports_numpy(reports, False)),
+        part_two=lambda reports: len(m.find_safe_reports_numpy(reports, True)),
+    )
+
+
+@solver(2024, 2, "parallel")
+def day2_parallel():
+    m = load_day(2024, 2)
+    # The reports are streamed from the file, so there is nothing to parse upfront
+    return Solver(parse=lambda path: path, both=m.count_safe_reports)
+
+
+@solver(2024, 3)
+def day3():
+    m = load_day(2024, 3)
+    # The solution only handles the do() and don't() instructions of part two
+    return Solver(parse=m.read_memory, part_two=m.scan)
+
+
+@solver(2024, 3, "parallel")
+def day3_parallel():
+    m = load_day(2024, 3)
+    # The file is memory mapped by the workers, there is nothing to parse upfront
+    return Solver(parse=lambda path: path, part_two=m.scan_parallel)
+
+
+@solver(2024, 3, "tokens")
+def day3_tokens():
+    m = load_day(2024, 3)
+    return Solver(parse=lambda path: m.tokenize(read_text(path)), part_two=m.parse)
+
+
+@solver(2024, 4)
+def day4():
+    m = load_day(2024, 4)
+    return Solver(
+        parse=Grid.from_file,
+        part_one=m.find_xmas,
+        part_two=m.find_xmas_part_two,
+    )
+
+
+@solver(2024, 4, "numpy")
+def day4_numpy():
+    m = load_day(2024, 4)
+    return Solver(
+        parse=Grid.from_file,
+        part_one=lambda grid: m.count_words(grid, [m.XMAS])[m.XMAS],
+        part_two=lambda grid: m.count_stencils(grid, m.symmetries(m.X_MAS)),
+    )
+
+
+@solver(2024, 5)
+def day5():
+    m = load_day(2024, 5)
+    return Solver(
+        parse=read_lines, part_one=m.solve_part_one, part_two=m.solve_part_two
+    )
+
+
+@solver(2024, 5, "numpy")
+def day5_numpy():
+    m = load_day(2024, 5)
+    return Solver(parse=m.read_manual, both=lambda manual: m.evaluate_updates(*manual))
+
+
+@solver(2024, 5, "parallel")
+def day5_parallel():
+    m = load_day(2024, 5)
+    return Solver(parse=m.read_manual, both=m.solve_parallel)
+
+
+@solver(2024, 6)
+def day6():
+    m = load_day(2024, 6)
+
+    def part_one(grid_map):
+        grid_map.walk()
+        return grid_map.num_visited()
+
+    return Solver(
+        parse=lambda path: m.Map.from_grid(Grid.from_file(path)),
+        part_one=part_one,
+        # Explores the positions visited in part one
+        part_two=lambda grid_map: len(grid_map.solve_part_two()),
+    )
+
+
+@solver(2024, 6, "parallel")
+def day6_parallel():
+    m = load_day(2024, 6)
+
+    def part_one(grid_map):
+        grid_map.walk()
+        return grid_map.num_visited()
+
+    return Solver(
+        parse=lambda path: m.Map.from_grid(Grid.from_file(path)),
+        part_one=part_one,
+        part_two=lambda grid_map: len(grid_map.solve_part_two_parallel()),
+    )
+
+
+@solver(2024, 7)
+def day7():
+    m = load_day(2024, 7)
+    return Solver(
+        parse=m.read_equations,
+        part_one=lambda equations: m.solve_equations_backward(
+            equations, m.PART_ONE_OPERATORS
+        ),
+        part_two=lambda equations: m.solve_equations_backward(
+            equations, m.PART_TWO_OPERATORS
+        ),
+    )
+
+
+@solver(2024, 7, "parallel")
+def day7_parallel():
+    m = load_day(2024, 7)
+    return Solver(parse=lambda path: path, both=m.solve_file)
+
+
+@solver(2024, 7, "forward")
+def day7_forward():
+    m = load_day(2024, 7)
+    # OPERATIONS includes concatenation so this is the part two answer
+    return Solver(parse=m.read_equations, part_two=m.solve_equations)
+
+
+@solver(2024, 8)
+def day8():
+    m = load_day(2024, 8)
+
+    def parse(path):
+        grid = Grid.from_file(path)
+        return m.find_symbols(grid), grid
+
+    return Solver(
+        parse=parse,
+        part_one=lambda data: len(m.find_antinodes(*data, extend_antinodes=False)),
+        part_two=lambda data: len(m.find_antinodes(*data, extend_antinodes=True)),
+    )
+
+
+@solver(2024, 8, "numpy")
+def day8_numpy():
+    m = load_day(2024, 8)
+
+    def parse(path):
+        grid = Grid.from_file(path)
+        return m.find_frequencies(grid), grid
+
+    return Solver(
+        parse=parse,
+        part_one=lambda data: int(
+            m.antinode_map(data[0], data[1].height, data[1].width).sum()
+        ),
+        part_two=lambda data: int(
+            m.resonant_antinode_map(data[0], data[1].height, data[1].width).sum()
+        ),
+    )
+
+
+@solver(2024, 9)
+def day9():
+    m = load_day(2024, 9)
+    return Solver(
+        parse=lambda path: read_text(path).strip(),
+        part_one=lambda disk: m.calculate_checksum(m.move_blocks(m.convert(disk))),
+        part_two=lambda disk: m.calculate_checksum(
+            m.move_blocks_part_two(m.convert(disk))
+        ),
+    )
+
+
+@solver(2024, 9, "segments")
+def day9_segments():
+    m = load_day(2024, 9)
+    return Solver(
+        parse=lambda path: read_text(path).strip(),
+        part_one=m.compact_checksum,
+        part_two=m.segment_checksum,
+    )
+
+
+@solver(2024, 10)
+def day10():
+    m = load_day(2024, 10)
+    return Solver(
+        parse=Grid.from_file,
+        both=m.find_paths,
+    )
+
+
+@solver(2024, 10, "layers")
+def day10_layers():
+    m = load_day(2024, 10)
+    return Solver(parse=Grid.from_file, both=m.rate_trails)
+
+
+@solver(2024, 11)
+def day11():
+    m = load_day(2024, 11)
+
+    def parse(path):
+        # Repeated runs would otherwise be served from the cache
+        m.get_stones.cache_clear()
+        return m.parse_stones(read_text(path).strip())
+
+    return Solver(
+        parse=parse,
+        part_one=lambda stones: m.blink(stones, num_blinks=25),
+        part_two=lambda stones: m.blink(stones, num_blinks=75),
+    )
+
+
+@solver(2024, 12)
+def day12():
+    m = load_day(2024, 12)
+    return Solver(
+        parse=Grid.from_file,
+        both=lambda grid: m.calculate_costs(m.define_perimiters(grid), grid),
+    )
+
+
+@solver(2024, 13)
+def day13():
+    m = load_day(2024, 13)
+
+    return Solver(
+        parse=m.read_claw_machines,
+        part_one=m.solve_all_claw_machines,
+        part_two=lambda machines: m.solve_all_claw_machines(machines, m.OFFSET),
+    )
+
+
+@solver(2024, 14)
+def day14():
+    m = load_day(2024, 14)
+
+    def parse(path):
+        robots = m.read_robots(path)
+        return robots, m.find_room(robots)
+
+    def part_one(data):
+        robots, room = data
+        # Jump straight to the last second, simulate_robots draws the room
+        # every time the entropy drops
+        robots = [r.move(room, m.NUM_SECONDS) for r in robots]
+        result, _ = m.assign_robot_quadrant(robots, room)
+        return result
+
+    # Part two is found by looking for the christmas tree in the output
+    return Solver(parse=parse, part_one=part_one)
+
+
+@solver(2024, 15)
+def day15():
+    m = load_day(2024, 15)
+
+    def part_one(text):
+        warehouse, steps = m.parse_input(text)
+        return m.simulate_steps(warehouse, steps).get_gps_coordinates()
+
+    def part_two(text):
+        warehouse, steps = m.parse_input(text)
+        warehouse.resize()
+        return m.simulate_steps(warehouse, steps).get_gps_coordinates()
+
+    # The warehouse is mutated by the robot, each part parses its own copy
+    return Solver(
+        parse=lambda path: read_text(path).strip(),
+        part_one=part_one,
+        part_two=part_two,
+    )
+
+
+@solver(2024, 16)
+def day16():
+    m = load_day(2024, 16, "solution2")
+
+    def both(data):
+        start, end, maze = data
+        return m.shortest_paths(start, "RIGHT", end, maze)
+
+    return Solver(
+        parse=lambda path: m.parse_maze(read_text(path).strip()),
+        both=both,
+    )
+
+
+@solver(2024, 17)
+def day17():
+    m = load_day(2024, 17)
+
+    def part_one(program):
+        outputs = program.execute(program.registers["A"])
+        return ",".join(str(o) for o in outputs)
+
+    return Solver(
+        parse=lambda path: m.parse_program(read_text(path).strip()),
+        part_one=part_one,
+        part_two=m.solve,
+    )
+
+
+@solver(2024, 18)
+def day18():
+    m = load_day(2024, 18)
+
+    def parse(path):
+        byte_positions = m.parse_input(path)
+        return byte_positions, m.find_memory_size(byte_positions)
+
+    def part_one(data):
+        byte_positions, (max_x, max_y, num_bytes) = data
+        memory = m.create_memory_space(byte_positions, num_bytes, max_x, max_y)
+        target = m.BytePos(max_x, max_y)
+        return len(m.find_shortest_path(memory, m.BytePos(0, 0), target))
+
+    def part_two(data):
+        byte_positions, (max_x, max_y, _) = data
+        byte_pos = m.solve_part_two(byte_positions, max_x, max_y)
+        return f"{byte_pos.x},{byte_pos.y}" if byte_pos else None
+
+    return Solver(parse=parse, part_one=part_one, part_two=part_two)
+
+
+@solver(2024, 19)
+def day19():
+    m = load_day(2024, 19)
+    return Solver(parse=m.parse_input, both=lambda data: m.solve_patterns(*data))
+
+
+@solver(2024, 20)
+def day20():
+    m = load_day(2024, 20)
+    return Solver(
+        parse=m.parse_input,
+        part_one=lambda grid: m.solve(grid, 2, 100),
+        part_two=lambda grid: m.solve(grid, 20, 100),
+    )
+
+
+@solver(2025, 10)
+def day10_2025():
+    m = load_day(2025, 10)
+    return Solver(
+        parse=lambda path: m.parse_machines(read_lines(path)),
+        part_one=lambda machines: sum(m.solve_part_1(machine) for machine in machines),
+        part_two=lambda machines: sum(m.solve_part_2(machine) for machine in machines),
+    )
@@ -0,0 +1,38 @@
+"""
+Synthetic puzzle inputs of a requested size, used to test how the solutions
+scale beyond the size of the puzzle inputs.
+
+The meaning of size depends on the day, e.g. the side of a grid or the number
+of lines, see the docstring of each generator.
+"""
+
+import random
+from typing import Callable
+
+type Generator = Callable[[int, random.Random], str]
+
+GENERATORS: dict[tuple[int, int], Generator] = {}
+
+
+def generator(year: int, day: int):
+    def register(fn: Generator) -> Generator:
+        GENERATORS[(year, day)] = fn
+        return fn
+
+    return register
+
+
+def generate(year: int, day: int, size: int, seed: int = 0) -> str:
+    # Importing registers all the generators
+    from aoc.generators import y2024  # noqa: F401
+
+    fn = GENERATORS.get((year, day))
+    if fn is None:
+        raise KeyError(f"No generator registered for {year} day {day}")
+    return fn(size, random.Random(seed))
+
+
+def write_input(year: int, day: int, size: int, path: str, seed: int = 0) -> str:
+    with open(path, "w") as file:
+        file.write(generate(year, day, size, seed))
+    return path
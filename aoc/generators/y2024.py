@@ -0,0 +1,396 @@
+import math
+import random
+import string
+
+from aoc.generators import generator
+
+DIRECTIONS = ((-1, 0), (0, 1), (1, 0), (0, -1))
+
+
+def random_letters(rng: random.Random, n: int, letters: bytes) -> bytes:
+    # Maps random bytes onto the letters, a lot faster than rng.choice per cell
+    table = bytes(letters[b % len(letters)] for b in range(256))
+    return rng.randbytes(n).translate(table)
+
+
+def join_rows(rows) -> str:
+    return "\n".join(row.decode() for row in rows) + "\n"
+
+
+@generator(2024, 1)
+def day1(size: int, rng: random.Random) -> str:
+    """size: number of location id pairs"""
+    low, high = 10000, 10000 + max(size, 10)
+    left = [rng.randrange(low, high) for _ in range(size)]
+    # Draw half of the right list from the left one so the similarity score is useful
+    right = [
+        rng.choice(left) if rng.random() < 0.5 else rng.randrange(low, high)
+        for _ in range(size)
+    ]
+    return "".join(f"{a}   {b}\n" for a, b in zip(left, right))
+
+
+@generator(2024, 2)
+def day2(size: int, rng: random.Random) -> str:
+    """size: number of reports"""
+    lines = []
+    for _ in range(size):
+        levels = [rng.randint(30, 60)]
+        sign = rng.choice((-1, 1))
+        for _ in range(rng.randint(4, 7)):
+            levels.append(levels[-1] + sign * rng.randint(1, 3))
+        if rng.random() < 0.4:
+            # break the report with a repeated level, a big jump or a change in direction
+            i = rng.randrange(len(levels))
+            levels[i] += rng.choice((0, 4, 5, -sign * 2))
+        lines.append(" ".join(map(str, levels)))
+    return "\n".join(lines) + "\n"
+
+
+@generator(2024, 3)
+def day3(size: int, rng: random.Random) -> str:
+    """size: number of instructions and pieces of corrupted memory"""
+
+    def number() -> int:
+        return rng.randint(1, 999)
+
+    pieces = [
+        lambda: f"mul({number()},{number()})",
+        lambda: f"mul({number()},{number()})",
+        lambda: f"mul({number()},{number()}]",
+        lambda: f"mul ( {number()},{number()})",
+        lambda: f"mul({number()}*{number()})",
+        lambda: "do()",
+        lambda: "don't()",
+        lambda: rng.choice(("what()", "from()", "select()", "when()", "how()")),
+        lambda: "".join(rng.choices("!@#$%^&*()[]{}<>?,.+-_ '", k=rng.randint(1, 6))),
+    ]
+    lines = []
+    for start in range(0, size, 200):
+        lines.append(
+            "".join(rng.choice(pieces)() for _ in range(min(200, size - start)))
+        )
+    return "\n".join(lines) + "\n"
+
+
+@generator(2024, 4)
+def day4(size: int, rng: random.Random) -> str:
+    """size: side of the letter grid"""
+    return join_rows(random_letters(rng, size, b"XMAS") for _ in range(size))
+
+
+@generator(2024, 5)
+def day5(size: int, rng: random.Random) -> str:
+    """size: number of updates"""
+    pages = list(range(10, 100))
+    rng.shuffle(pages)
+    # Rules for every pair of a random total order, so every update can be fixed
+    rules = [
+        f"{pages[i]}|{pages[j]}"
+        for i in range(len(pages))
+        for j in range(i + 1, len(pages))
+    ]
+    rng.shuffle(rules)
+    updates = []
+    for _ in range(size):
+        update = rng.sample(pages, rng.randrange(5, 24, 2))
+        if rng.random() < 0.5:
+            update.sort(key=pages.index)
+        updates.append(",".join(map(str, update)))
+    return "\n".join(rules) + "\n\n" + "\n".join(updates) + "\n"
+
+
+def guard_leaves(rows: list[bytearray], row: int, col: int) -> bool:
+    direction = 0
+    seen = set()
+    while (row, col, direction) not in seen:
+        seen.add((row, col, direction))
+        dr, dc = DIRECTIONS[direction]
+        r, c = row + dr, col + dc
+        if not (0 <= r < len(rows) and 0 <= c < len(rows[0])):
+            return True
+        if rows[r][c] == ord("#"):
+            direction = (direction + 1) % 4
+        else:
+            row, col = r, c
+    return False
+
+
+@generator(2024, 6)
+def day6(size: int, rng: random.Random) -> str:
+    """size: side of the guard map"""
+    rows = [bytearray(random_letters(rng, size, b"." * 32 + b"#")) for _ in range(size)]
+    # The guard has to leave the map in part one, try new start positions until it does
+    while True:
+        row, col = rng.randrange(size), rng.randrange(size)
+        if rows[row][col] == ord(".") and guard_leaves(rows, row, col):
+            break
+    rows[row][col] = ord("^")
+    return join_rows(rows)
+
+
+@generator(2024, 7)
+def day7(size: int, rng: random.Random) -> str:
+    """size: number of equations"""
+    lines = []
+    for _ in range(size):
+        numbers = [
+            rng.choice((rng.randint(1, 9), rng.randint(1, 99), rng.randint(1, 999)))
+            for _ in range(rng.randint(3, 12))
+        ]
+        target = numbers[0]
+        for n in numbers[1:]:
+            match rng.randrange(3):
+                case 0:
+                    target += n
+                case 1:
+                    target *= n
+                case _:
+                    target = int(f"{target}{n}")
+        if rng.random() < 0.3:
+            target += rng.randint(1, 9)
+        lines.append(f"{target}: {' '.join(map(str, numbers))}")
+    return "\n".join(lines) + "\n"
+
+
+@generator(2024, 8)
+def day8(size: int, rng: random.Random) -> str:
+    """size: side of the antenna map"""
+    frequencies = (string.digits + string.ascii_letters).encode()
+    cells = bytearray(b"." * (size * size))
+    for i in rng.sample(range(size * size), max(2, size * size // 12)):
+        cells[i] = rng.choice(frequencies)
+    return join_rows(cells[i : i + size] for i in range(0, len(cells), size))
+
+
+@generator(2024, 9)
+def day9(size: int, rng: random.Random) -> str:
+    """size: number of digits in the disk map"""
+    size = max(1, size | 1)
+    disk = bytearray(size)
+    num_files = (size + 1) // 2
+    disk[0::2] = random_letters(rng, num_files, b"123456789")
+    disk[1::2] = random_letters(rng, num_files - 1, b"0123456789")
+    return disk.decode() + "\n"
+
+
+@generator(2024, 10)
+def day10(size: int, rng: random.Random) -> str:
+    """size: side of the trail map"""
+    rows = [bytearray(random_letters(rng, size, b"0123456789")) for _ in range(size)]
+    # Carve random hiking trails from 0 to 9 into the noise
+    for _ in range(max(1, size * size // 40)):
+        r, c = rng.randrange(size), rng.randrange(size)
+        for height in b"0123456789":
+            rows[r][c] = height
+            dr, dc = rng.choice(DIRECTIONS)
+            r, c = min(max(r + dr, 0), size - 1), min(max(c + dc, 0), size - 1)
+    return join_rows(rows)
+
+
+@generator(2024, 11)
+def day11(size: int, rng: random.Random) -> str:
+    """size: number of stones"""
+    return " ".join(str(rng.randint(0, 10**6)) for _ in range(size)) + "\n"
+
+
+@generator(2024, 12)
+def day12(size: int, rng: random.Random) -> str:
+    """size: side of the garden"""
+    rows: list[bytearray] = []
+    crops = string.ascii_uppercase.encode()
+    for i in range(size):
+        row = bytearray(size)
+        for j in range(size):
+            # Copy a neighbouring crop most of the time to grow regions
+            choice = rng.random()
+            if choice < 0.45 and i > 0:
+                row[j] = rows[-1][j]
+            elif choice < 0.9 and j > 0:
+                row[j] = row[j - 1]
+            else:
+                row[j] = rng.choice(crops)
+        rows.append(row)
+    return join_rows(rows)
+
+
+@generator(2024, 13)
+def day13(size: int, rng: random.Random) -> str:
+    """size: number of claw machines"""
+    blocks = []
+    for _ in range(size):
+        while True:
+            a_x, a_y, b_x, b_y = (rng.randint(10, 99) for _ in range(4))
+            # the solution divides by the determinant
+            if a_x * b_y - a_y * b_x != 0:
+                break
+        a, b = rng.randint(1, 100), rng.randint(1, 100)
+        p_x, p_y = a * a_x + b * b_x, a * a_y + b * b_y
+        if rng.random() < 0.4:
+            p_x, p_y = p_x + rng.randint(1, 50), p_y + rng.randint(1, 50)
+        blocks.append(
+            f"Button A: X+{a_x}, Y+{a_y}\n"
+            f"Button B: X+{b_x}, Y+{b_y}\n"
+            f"Prize: X={p_x}, Y={p_y}\n"
+        )
+    return "\n".join(blocks)
+
+
+@generator(2024, 14)
+def day14(size: int, rng: random.Random) -> str:
+    """size: number of robots, the room grows with the swarm"""
+    # 500 robots fit in the 101x103 puzzle room, the room needs odd sides
+    wide = max(101, math.isqrt(size * 20) + 1) | 1
+    tall = wide + 2
+    lines = []
+    for i in range(size):
+        x, y = rng.randrange(wide), rng.randrange(tall)
+        if i == 0:
+            # The robot in the far corner tells the solution how big the room is
+            x, y = wide - 1, tall - 1
+        v_x, v_y = rng.randint(-wide + 1, wide - 1), rng.randint(-tall + 1, tall - 1)
+        lines.append(f"p={x},{y} v={v_x},{v_y}")
+    return "\n".join(lines) + "\n"
+
+
+@generator(2024, 15)
+def day15(size: int, rng: random.Random) -> str:
+    """size: side of the warehouse, with 8 robot moves per square"""
+    size = max(size, 4)
+    rows = [bytearray(b"#" * size)]
+    for _ in range(size - 2):
+        row = bytearray(random_letters(rng, size - 2, b"." * 13 + b"O" * 6 + b"#"))
+        rows.append(bytearray(b"#") + row + b"#")
+    rows.append(bytearray(b"#" * size))
+    # resize() doubles the robot column in place, keep it in the left half
+    rows[size // 2][size // 4 + 1] = ord("@")
+    moves = random_letters(rng, size * size * 8, b"<v>^")
+    move_lines = [moves[i : i + 1000] for i in range(0, len(moves), 1000)]
+    return join_rows(rows) + "\n" + join_rows(move_lines)
+
+
+@generator(2024, 16)
+def day16(size: int, rng: random.Random) -> str:
+    """size: side of the maze, rounded up to an odd number"""
+    size = max(5, size | 1)
+    rows = [bytearray(b"#" * size) for _ in range(size)]
+    wall, path = ord("#"), ord(".")
+    # Carve a perfect maze with a depth first search over the odd cells
+    stack = [(size - 2, 1)]
+    rows[size - 2][1] = path
+    while stack:
+        r, c = stack[-1]
+        options = [
+            (r + 2 * dr, c + 2 * dc, r + dr, c + dc)
+            for dr, dc in DIRECTIONS
+            if 0 < r + 2 * dr < size - 1
+            and 0 < c + 2 * dc < size - 1
+            and rows[r + 2 * dr][c + 2 * dc] == wall
+        ]
+        if not options:
+            stack.pop()
+            continue
+        r, c, wall_r, wall_c = rng.choice(options)
+        rows[wall_r][wall_c] = rows[r][c] = path
+        stack.append((r, c))
+    # Knock out some walls between cells so there are multiple best paths
+    for _ in range(size * size // 50):
+        r, c = rng.randrange(1, size - 1), rng.randrange(1, size - 1)
+        if r % 2 != c % 2:
+            rows[r][c] = path
+    rows[size - 2][1] = ord("S")
+    rows[1][size - 2] = ord("E")
+    return join_rows(rows)
+
+
+def program_has_quine(x: int, y: int, program: list[int]) -> bool:
+    # Builds A three bits at a time from the last output backwards
+    def first_output(a: int) -> int:
+        b = (a % 8) ^ x
+        return (b ^ y ^ (a >> b)) % 8
+
+    candidates = [0]
+    for output in reversed(program):
+        candidates = [
+            a * 8 + bits
+            for a in candidates
+            for bits in range(8)
+            if a * 8 + bits and first_output(a * 8 + bits) == output
+        ]
+    return bool(candidates)
+
+
+@generator(2024, 17)
+def day17(size: int, rng: random.Random) -> str:
+    """size: number of outputs of the program"""
+    # Same shape as the puzzle programs: shift A by 3 bits and output B every loop,
+    # the constants are picked so part two has an answer.
+    while True:
+        x, y = rng.randrange(8), rng.randrange(8)
+        program = [2, 4, 1, x, 7, 5, 1, y, 4, rng.randrange(8), 0, 3, 5, 5, 3, 0]
+        if program_has_quine(x, y, program):
+            break
+    a = rng.getrandbits(3 * size) | (1 << (3 * size - 1))
+    return (
+        f"Register A: {a}\nRegister B: 0\nRegister C: 0\n\n"
+        f"Program: {','.join(map(str, program))}\n"
+    )
+
+
+@generator(2024, 18)
+def day18(size: int, rng: random.Random) -> str:
+    """size: side of the memory space, at least the 71 of the puzzle"""
+    size = max(size, 71)
+    area = size * size
+    corners = [size - 1, (size - 1) * size]
+    # Leave the start and the exit free, the corners tell the solution its size
+    cells = [i for i in range(1, area - 1) if i not in corners]
+    falling = rng.sample(cells, int(area * 0.7))
+    for corner in corners:
+        falling.insert(rng.randrange(len(falling) + 1), corner)
+    return "".join(f"{i % size},{i // size}\n" for i in falling)
+
+
+@generator(2024, 19)
+def day19(size: int, rng: random.Random) -> str:
+    """size: number of designs"""
+    # Leaving out the single b towel makes some of the designs impossible
+    towels = {"w", "u", "r", "g"}
+    while len(towels) < 400:
+        towels.add("".join(rng.choices("wubrg", k=rng.randint(2, 8))))
+    towel_list = sorted(towels)
+    designs = []
+    for _ in range(size):
+        length = rng.randint(20, 60)
+        if rng.random() < 0.6:
+            design = ""
+            while len(design) < length:
+                design += rng.choice(towel_list)
+        else:
+            design = "".join(rng.choices("wubrg", k=length))
+        designs.append(design)
+    return ", ".join(towel_list) + "\n\n" + "\n".join(designs) + "\n"
+
+
+@generator(2024, 20)
+def day20(size: int, rng: random.Random) -> str:
+    """size: side of the racetrack"""
+    size = max(size, 7)
+    rows = [bytearray(b"#" * size) for _ in range(size)]
+    path = ord(".")
+    # A single track winding back and forth through the walls
+    r, left = 1, True
+    rows[1][1] = ord("S")
+    while True:
+        for c in range(1, size - 1):
+            if rows[r][c] != ord("S"):
+                rows[r][c] = path
+        end = size - 2 if left else 1
+        thickness = rng.randint(1, 2)
+        if r + thickness + 1 > size - 2:
+            rows[r][end] = ord("E")
+            break
+        for i in range(r + 1, r + thickness + 1):
+            rows[i][end] = path
+        r, left = r + thickness + 1, not left
+    return join_rows(rows)
@@ -0,0 +1,134 @@
+"""
+Flat byte grid shared by the grid days.
+
+Cells are stored row by row in one bytearray, one byte per cell, with a stride
+of width + 1. The extra column plus a row above and below the grid hold the
+BORDER byte, so a step off the grid in any direction (diagonals included)
+lands on a border cell and solutions don't need bounds checks. Since the
+border is the newline, the rows of a puzzle input are already laid out this
+way and are loaded with a single read.
+"""
+
+import os
+from typing import Iterator
+
+BORDER = ord("\n")
+
+UP, RIGHT, DOWN, LEFT = range(4)
+
+
+class Grid:
+    def __init__(self, cells: bytearray, width: int, height: int):
+        self.cells = cells
+        self.width = width
+        self.height = height
+        self.stride = width + 1
+        # Indexed by UP, RIGHT, DOWN, LEFT, turning right is (direction + 1) % 4
+        self.offsets = (-self.stride, 1, self.stride, -1)
+        self.diagonal_offsets = (
+            -self.stride - 1,
+            -self.stride + 1,
+            self.stride + 1,
+            self.stride - 1,
+        )
+
+    @classmethod
+    def _from_buffer(cls, cells: bytearray, stride: int, size: int) -> "Grid":
+        """
+        cells holds the input at offset stride, with room for a missing final
+        newline and the bottom border after it.
+        """
+        end = stride + size
+        # Drop trailing blank lines and whitespace
+        while end > stride and cells[end - 1] in b"\r\n\t ":
+            end -= 1
+        if end == stride:
+            raise ValueError("Grid input is empty")
+        rows_size = end + 1 - stride
+        if rows_size % stride:
+            raise ValueError("Grid rows have different lengths")
+        height = rows_size // stride
+        del cells[end + 1 + stride :]
+        cells[end : end + 1 + stride] = bytes([BORDER]) * (1 + stride)
+        return cls(cells, stride - 1, height)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "Grid":
+        newline = data.find(b"\n")
+        stride = (newline if newline != -1 else len(data)) + 1
+        cells = bytearray([BORDER]) * (2 * stride + len(data) + 1)
+        cells[stride : stride + len(data)] = data
+        return cls._from_buffer(cells, stride, len(data))
+
+    @classmethod
+    def from_text(cls, text: str) -> "Grid":
+        return cls.from_bytes(text.encode())
+
+    @classmethod
+    def from_file(cls, path: str) -> "Grid":
+        # Reads the file straight into the grid buffer, skipping the copies of
+        # file.read() and str.encode()
+        with open(path, "rb") as file:
+            first_row = file.readline().rstrip(b"\r\n")
+            size = os.fstat(file.fileno()).st_size
+            stride = len(first_row) + 1
+            cells = bytearray([BORDER]) * (2 * stride + size + 1)
+            file.seek(0)
+            size = file.readinto(memoryview(cells)[stride : stride + size])
+        return cls._from_buffer(cells, stride, size)
+
+    @classmethod
+    def filled(cls, width: int, height: int, fill: bytes = b".") -> "Grid":
+        return cls.from_bytes((fill * width + b"\n") * height)
+
+    def copy(self) -> "Grid":
+        return Grid(self.cells[:], self.width, self.height)
+
+    def index(self, row: int, col: int) -> int:
+        return (row + 1) * self.stride + col
+
+    def pos(self, index: int) -> tuple[int, int]:
+        row, col = divmod(index, self.stride)
+        return row - 1, col
+
+    def in_bounds(self, row: int, col: int) -> bool:
+        return 0 <= row < self.height and 0 <= col < self.width
+
+    def indices(self) -> Iterator[int]:
+        for start in range(self.stride, (self.height + 1) * self.stride, self.stride):
+            yield from range(start, start + self.width)
+
+    def find(self, value: bytes) -> int:
+        return self.cells.find(value, self.stride)
+
+    def find_all(self, value: bytes) -> list[int]:
+        found = []
+        i = self.cells.find(value, self.stride)
+        while i != -1:
+            found.append(i)
+            i = self.cells.find(value, i + 1)
+        return found
+
+    def rows(self) -> list[bytes]:
+        return [
+            bytes(self.cells[start : start + self.width])
+            for start in range(
+                self.stride, (self.height + 1) * self.stride, self.stride
+            )
+        ]
+
+    def as_array(self):
+        """Writable (height, width) numpy view of the cells."""
+        import numpy as np
+
+        cells = np.frombuffer(self.cells, dtype=np.uint8)
+        return cells.reshape(self.height + 2, self.stride)[1:-1, : self.width]
+
+    def __getitem__(self, index: int) -> int:
+        return self.cells[index]
+
+    def __setitem__(self, index: int, value: int):
+        self.cells[index] = value
+
+    def __str__(self) -> str:
+        return self.cells[self.stride : -self.stride].decode()
@@ -0,0 +1,42 @@
+"""
+Process pool helpers for the solutions that split their input into chunks.
+"""
+
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, Iterable, Iterator
+
+
+def default_workers() -> int:
+    return os.cpu_count() or 1
+
+
+def imap_bounded[T, R](
+    fn: Callable[[T], R],
+    items: Iterable[T],
+    workers: int | None = None,
+    in_flight: int | None = None,
+    initializer: Callable[..., object] | None = None,
+    initargs: tuple = (),
+) -> Iterator[R]:
+    """
+    Like ProcessPoolExecutor.map, but only takes the next item from items once
+    a slot is free so a lazily read input is never fully in memory. Results
+    are yielded in the order of items.
+
+    initializer is called with initargs once in every worker, to hand them
+    data shared by all the items.
+    """
+    workers = workers or default_workers()
+    in_flight = in_flight or 2 * workers
+    with ProcessPoolExecutor(
+        workers, initializer=initializer, initargs=initargs
+    ) as pool:
+        pending: deque[Future[R]] = deque()
+        for item in items:
+            if len(pending) >= in_flight:
+                yield pending.popleft().result()
+            pending.append(pool.submit(fn, item))
+        while pending:
+            yield pending.popleft().result()
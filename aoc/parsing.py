@@ -0,0 +1,145 @@
+"""
+Bulk integer extraction for the days whose input is mostly numbers.
+
+The file is memory mapped and every integer is found in one vectorized pass
+over the bytes, instead of splitting and calling int() per value. Records,
+e.g. the lines of a file, are kept as offsets into the flat value array so
+ragged rows like the day2 reports don't need a list per row.
+"""
+
+import mmap
+import traceback
+from dataclasses import dataclass
+from itertools import pairwise
+from typing import Iterator
+
+import numpy as np
+
+ZERO, NINE, MINUS, NEWLINE = ord("0"), ord("9"), ord("-"), ord("\n")
+
+# More digits than this can overflow an int64, inputs with longer integers get
+# an object array of Python ints instead
+MAX_DIGITS = 18
+
+
+@dataclass(frozen=True)
+class IntRecords:
+    values: np.ndarray
+    # Record i is values[offsets[i] : offsets[i + 1]]
+    offsets: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> np.ndarray:
+        return self.values[self.offsets[i] : self.offsets[i + 1]]
+
+    def __iter__(self) -> Iterator[np.ndarray]:
+        for start, end in pairwise(self.offsets.tolist()):
+            yield self.values[start:end]
+
+    def lengths(self) -> np.ndarray:
+        return np.diff(self.offsets)
+
+    def slice(self, start: int, stop: int) -> "IntRecords":
+        """Records start to stop, with offsets starting at 0 again."""
+        offsets = self.offsets[start : stop + 1]
+        return IntRecords(self.values[offsets[0] : offsets[-1]], offsets - offsets[0])
+
+    def by_length(self) -> Iterator[tuple[np.ndarray, np.ndarray]]:
+        """
+        Yields the indices and a (records, length) array of the records of
+        each length, so same length records can be processed as a 2D array.
+        """
+        lengths = self.lengths()
+        for length in np.unique(lengths).tolist():
+            rows = np.flatnonzero(lengths == length)
+            yield rows, self.values[self.offsets[rows, None] + np.arange(length)]
+
+    def tolist(self) -> list[list[int]]:
+        # Python ints are a lot faster than numpy scalars in the solvers' loops
+        values = self.values.tolist()
+        return [values[start:end] for start, end in pairwise(self.offsets.tolist())]
+
+
+def _find_ints(buffer: np.ndarray, signed: bool) -> tuple[np.ndarray, np.ndarray]:
+    """Returns the values and the byte offsets where each of them starts."""
+    is_digit = (buffer >= ZERO) & (buffer <= NINE)
+    edges = np.diff(is_digit.view(np.int8), prepend=0, append=0)
+    starts = np.flatnonzero(edges == 1)
+    lengths = np.flatnonzero(edges == -1) - starts
+    long = np.flatnonzero(lengths > MAX_DIGITS)
+    # One pass per digit position rather than per digit keeps the temporaries
+    # as small as the number of integers
+    values = np.zeros(len(starts), dtype=np.int64)
+    last = len(buffer) - 1
+    for k in range(min(int(lengths.max()), MAX_DIGITS) if len(lengths) else 0):
+        active = (lengths > k) & (lengths <= MAX_DIGITS)
+        digits = buffer[np.minimum(starts + k, last)].astype(np.int64) - ZERO
+        values = np.where(active, values * 10 + digits, values)
+    if len(long):
+        values = values.astype(object)
+        for i, start, length in zip(long, starts[long], lengths[long]):
+            values[i] = int(bytes(buffer[start : start + length]))
+    if signed:
+        negative = np.zeros(len(starts), dtype=bool)
+        has_prefix = starts > 0
+        negative[has_prefix] = buffer[starts[has_prefix] - 1] == MINUS
+        values[negative] *= -1
+    return values, starts
+
+
+def parse_ints(data: bytes | mmap.mmap, signed: bool = True) -> np.ndarray:
+    values, _ = _find_ints(np.frombuffer(data, dtype=np.uint8), signed)
+    return values
+
+
+def parse_records(data: bytes | mmap.mmap, signed: bool = True) -> IntRecords:
+    """One record per line, trailing blank lines don't add empty records."""
+    buffer = np.frombuffer(data, dtype=np.uint8)
+    values, starts = _find_ints(buffer, signed)
+    line_ends = np.flatnonzero(buffer == NEWLINE)
+    offsets = np.searchsorted(starts, np.concatenate(([0], line_ends, [len(buffer)])))
+    non_empty = np.flatnonzero(np.diff(offsets))
+    end = non_empty[-1] + 2 if len(non_empty) else 1
+    return IntRecords(values, offsets[:end])
+
+
+def _read(path: str, parse, signed: bool):
+    with open(path, "rb") as file:
+        # mmap can't map an empty file
+        if file.seek(0, 2) == 0:
+            return parse(b"", signed)
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            try:
+                return parse(data, signed)
+            except Exception as e:
+                # The frames of the traceback hold numpy views of the mmap,
+                # which can't be closed while they exist
+                traceback.clear_frames(e.__traceback__)
+                raise
+
+
+def read_ints(path: str, signed: bool = True) -> np.ndarray:
+    return _read(path, parse_ints, signed)
+
+
+def read_records(path: str, signed: bool = True) -> IntRecords:
+    return _read(path, parse_records, signed)
+
+
+def read_line_chunks(path: str, chunk_bytes: int) -> Iterator[bytes]:
+    """
+    Yields the file about chunk_bytes at a time, cut after a newline so no
+    line is split between chunks.
+    """
+    with open(path, "rb") as file:
+        rest = b""
+        while chunk := file.read(chunk_bytes):
+            chunk = rest + chunk
+            end = chunk.rfind(b"\n") + 1
+            rest = chunk[end:]
+            if end:
+                yield chunk[:end]
+        if rest:
+            yield rest
@@ -0,0 +1,142 @@
+import contextlib
+import importlib
+import os
+import resource
+import statistics
+import sys
+import time
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable, NamedTuple
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+PHASES = ("parse", "part_one", "part_two", "both")
+
+
+class Solver(NamedTuple):
+    parse: Callable[[str], Any]
+    part_one: Callable[[Any], Any] | None = None
+    part_two: Callable[[Any], Any] | None = None
+    # Some days compute both answers in one go, they return (part_one, part_two)
+    both: Callable[[Any], tuple[Any, Any]] | None = None
+
+
+type SolverFactory = Callable[[], Solver]
+
+SOLVERS: dict[tuple[int, int, str], SolverFactory] = {}
+
+
+def solver(year: int, day: int, variant: str = "default"):
+    def register(factory: SolverFactory) -> SolverFactory:
+        SOLVERS[(year, day, variant)] = factory
+        return factory
+
+    return register
+
+
+def get_solver(year: int, day: int, variant: str = "default") -> Solver:
+    # Importing registers all the solvers
+    from aoc import days  # noqa: F401
+
+    factory = SOLVERS.get((year, day, variant))
+    if factory is None:
+        raise KeyError(f"No solver registered for {year} day {day} ({variant})")
+    return factory()
+
+
+def day_dir(year: int, day: int) -> Path:
+    return REPO_ROOT / str(year) / f"day{day}"
+
+
+def default_input(year: int, day: int) -> Path:
+    return day_dir(year, day) / "input.txt"
+
+
+def load_day(year: int, day: int, name: str = "main") -> ModuleType:
+    if str(REPO_ROOT) not in sys.path:
+        sys.path.insert(0, str(REPO_ROOT))
+    # Some days import their sibling modules directly, e.g. "from shared import ..."
+    directory = str(day_dir(year, day))
+    if directory not in sys.path:
+        sys.path.append(directory)
+    # The year directories are namespace packages, importing by name keeps the
+    # functions picklable for process pools.
+    return importlib.import_module(f"{year}.day{day}.{name}")
+
+
+def read_text(path: str) -> str:
+    with open(path, "r") as file:
+        return file.read()
+
+
+def read_lines(path: str) -> list[str]:
+    with open(path, "r") as file:
+        return file.readlines()
+
+
+def to_json_value(answer: Any) -> Any:
+    # numpy scalars
+    if hasattr(answer, "item"):
+        answer = answer.item()
+    if answer is None or isinstance(answer, (bool, int, float, str)):
+        return answer
+    return str(answer)
+
+
+def timed(fn: Callable, *args) -> tuple[Any, float]:
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def run_solver(solver: Solver, path: str, repeat: int = 1) -> dict[str, Any]:
+    timings: dict[str, list[float]] = {p: [] for p in PHASES}
+    answers: dict[str, Any] = {}
+    for _ in range(repeat):
+        # Solutions print debug output, keep it out of the report
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            data, elapsed = timed(solver.parse, path)
+            timings["parse"].append(elapsed)
+            if solver.both is not None:
+                (answers["part_one"], answers["part_two"]), elapsed = timed(
+                    solver.both, data
+                )
+                timings["both"].append(elapsed)
+            if solver.part_one is not None:
+                answers["part_one"], elapsed = timed(solver.part_one, data)
+                timings["part_one"].append(elapsed)
+            if solver.part_two is not None:
+                answers["part_two"], elapsed = timed(solver.part_two, data)
+                timings["part_two"].append(elapsed)
+    return {
+        "answers": {k: to_json_value(v) for k, v in answers.items()},
+        "phases": {
+            phase: {"min": min(t), "median": statistics.median(t)}
+            for phase, t in timings.items()
+            if t
+        },
+    }
+
+
+def run(
+    year: int,
+    day: int,
+    path: str | None = None,
+    repeat: int = 1,
+    variant: str = "default",
+) -> dict[str, Any]:
+    path = str(path or default_input(year, day))
+    report = run_solver(get_solver(year, day, variant), path, repeat)
+    return {
+        "year": year,
+        "day": day,
+        "variant": variant,
+        "input": path,
+        "repeat": repeat,
+        **report,
+        # Linux reports the peak resident set size in kilobytes
+        "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        # The biggest of the finished worker processes of the parallel variants
+        "children_peak_rss_kb": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    }